@@ -1,10 +1,16 @@
 import pygame
 import math
 import random
-import time
+import numpy as np
 from config import WIDTH, HEIGHT, WHITE, RED, GRAY, DARK_GRAY, YELLOW, BLUE, BLACK
 from colorsys import rgb_to_hsv, hsv_to_rgb
-from sprites import INGREDIENT_COLORS
+from sprites import INGREDIENTS
+from font_cache import get_font, render_text
+from particles import ParticleSystem, FLAME, SPILL, FLOUR, SUGAR, DROPLET
+from bowl_renderer import BowlRenderer
+from stamps import circle_stamp, rotated_blob_stamp, blit_stamps
+from profiler import profiler
+from dirty_rects import tracker
 
 def ensure_rgb(color):
     """Ensure color is in RGB format (3 components)"""
@@ -62,7 +68,7 @@ class AnimatedIngredient:
         self.target_x = WIDTH // 2
         self.target_y = HEIGHT // 2
         self.speed = 5
-        self.color = INGREDIENT_COLORS.get(name, (200, 200, 200))  # Use colors from sprites.py
+        self.color = INGREDIENTS.color(name)  # Use colors from the catalog's ingredient table
 
     def move(self):
         dx = self.target_x - self.x
@@ -87,13 +93,72 @@ class AnimatedIngredient:
         glow_color = (*self.color, 100)  # Semi-transparent glow
         pygame.draw.circle(circle_surface, glow_color, (20, 20), glow_radius)
         
-        screen.blit(circle_surface, (int(self.x) - 20, int(self.y) - 20))
+        tracker.mark(screen.blit(circle_surface, (int(self.x) - 20, int(self.y) - 20)))
         
         # Render text with transparent background
-        font = pygame.font.Font(None, 20)
-        text_surface = font.render(self.name[:1], True, BLACK, None)
-        screen.blit(text_surface, (int(self.x) - text_surface.get_width() // 2, 
-                                 int(self.y) - text_surface.get_height() // 2))
+        text_surface = render_text(self.name[:1], 20, BLACK)
+        tracker.mark(screen.blit(text_surface, (int(self.x) - text_surface.get_width() // 2, 
+                                 int(self.y) - text_surface.get_height() // 2)))
+
+class SparkleLayer:
+    """Sparkles shown around the bowl while its color is mixing.
+
+    Sparkle state persists between frames and is drawn into a surface that only
+    covers the bowl area, so the cost does not depend on the window size.
+    """
+
+    def __init__(self, center=(WIDTH//2, HEIGHT//2), half_width=110, half_height=90):
+        self.rect = pygame.Rect(0, 0, half_width * 2, half_height * 2)
+        self.rect.center = center
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.glows = []      # [x, y, size, phase, twinkle_speed] in layer coordinates
+        self.shooting = []   # [angle, distance, speed]
+        self.active = False
+
+    def start(self):
+        if self.active:
+            return
+        cx, cy = self.rect.width // 2, self.rect.height // 2
+        # Multiple layers of sparkles with different sizes
+        self.glows = [[cx + random.randint(-100, 100), cy + random.randint(-50, 50),
+                       random.randint(2, 6), random.uniform(0, 2 * math.pi), random.uniform(0.1, 0.3)]
+                      for _ in range(20)]
+        # Shooting sparkles that fly outwards from the bowl
+        self.shooting = [[random.uniform(0, 2 * math.pi), random.randint(30, 80), random.uniform(1, 3)]
+                         for _ in range(10)]
+        self.active = True
+
+    def stop(self):
+        self.active = False
+
+    def update(self):
+        for glow in self.glows:
+            glow[3] += glow[4]
+        for spark in self.shooting:
+            spark[1] += spark[2]
+            if spark[1] > 80:
+                spark[0] = random.uniform(0, 2 * math.pi)
+                spark[1] = 30
+
+    def draw(self, screen, glow_color):
+        if not self.active:
+            return
+        self.surface.fill((0, 0, 0, 0))
+        cx, cy = self.rect.width // 2, self.rect.height // 2
+
+        # Create a twinkling glow effect with multiple circles
+        for x, y, size, phase, _ in self.glows:
+            twinkle = 0.5 + 0.5 * math.sin(phase)
+            for radius in range(size, 0, -1):
+                alpha = int(200 * (radius/size) * twinkle)
+                pygame.draw.circle(self.surface, (*glow_color, alpha), (x, y), radius)
+
+        for angle, distance, _ in self.shooting:
+            x = cx + math.cos(angle) * distance
+            y = cy + math.sin(angle) * distance
+            pygame.draw.circle(self.surface, (255, 255, 255, 200), (int(x), int(y)), 2)
+
+        tracker.mark(screen.blit(self.surface, self.rect.topleft))
 
 class AnimationManager:
     def __init__(self):
@@ -113,13 +178,11 @@ class AnimationManager:
         self.disaster_duration = 180  # 3 seconds at 60 FPS
         self.current_disaster = None
         self.min_color_value = 100
-        self.disaster_particles = []
-        self.flicker_count = 0
-        self.flame_particles = []
-        self.steam_particles = []
-        self.flour_clouds = []
-        self.sugar_crystals = []
-        self.liquid_droplets = []
+        self.flicker_time = 0  # Seconds of power flicker left
+        # Flames, spill blobs, flour, sugar and droplets all share one particle pool
+        self.particles = ParticleSystem()
+        self.bowl_renderer = BowlRenderer()
+        self.sparkles = SparkleLayer()
         self.ingredient_effects = {
             "Flour": self.add_flour_effect,
             "Sugar": self.add_sugar_effect,
@@ -140,7 +203,7 @@ class AnimationManager:
         self.animated_ingredients.append(new_ingredient)
         self.is_animating = True
         # Don't add color transition until ingredient reaches bowl
-        self.pending_color_transitions.append((INGREDIENT_COLORS.get(ing, (255, 255, 255)), ing))
+        self.pending_color_transitions.append((INGREDIENTS.color(ing), ing))
 
     def mix_colors(self, color1, color2):
         """Mix colors while maintaining minimum visibility"""
@@ -171,6 +234,7 @@ class AnimationManager:
             # Store the transition
             self.color_transition = (self.bowl_color, mixed_color)
             self.transition_progress = 0
+            self.add_sparkle_effect()
             
         except Exception as e:
             print(f"Error in color transition: {e}")
@@ -195,12 +259,11 @@ class AnimationManager:
         if not self.error_messages:
             return
             
-        font = pygame.font.Font(None, 36)
         y_offset = 150  # Start below other UI elements
         
         for msg in self.error_messages:
             # Create semi-transparent background
-            text = font.render(msg['text'], True, (255, 50, 50))
+            text = render_text(msg['text'], 36, (255, 50, 50))
             bg_surface = pygame.Surface((text.get_width() + 20, text.get_height() + 10), pygame.SRCALPHA)
             pygame.draw.rect(bg_surface, (40, 0, 0, 180), bg_surface.get_rect(), border_radius=10)
             
@@ -208,8 +271,8 @@ class AnimationManager:
             x = WIDTH//2 - text.get_width()//2
             
             # Draw background and text
-            screen.blit(bg_surface, (x - 10, y_offset - 5))
-            screen.blit(text, (x, y_offset))
+            tracker.mark(screen.blit(bg_surface, (x - 10, y_offset - 5)))
+            tracker.mark(screen.blit(text, (x, y_offset)))
             
             y_offset += 40  # Space between messages
     
@@ -219,7 +282,7 @@ class AnimationManager:
             if self.transition_progress >= 1:
                 self.bowl_color = self.color_transition[1]
                 self.color_transition = None
-                self.add_sparkle_effect()
+                self.sparkles.stop()
             else:
                 # Smooth transition between colors
                 progress = self.transition_progress
@@ -234,30 +297,8 @@ class AnimationManager:
                 self.bowl_color = current_color
 
     def add_sparkle_effect(self):
-        # Create a surface for the sparkle effects
-        sparkle_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        
-        # Add multiple layers of sparkles with different sizes and colors
-        for _ in range(20):  # Increased number of sparkles
-            x = random.randint(WIDTH//2 - 100, WIDTH//2 + 100)
-            y = random.randint(HEIGHT//2 - 50, HEIGHT//2 + 50)
-            size = random.randint(2, 6)  # Varied sizes
-            
-            # Create a glowing effect with multiple circles
-            for radius in range(size, 0, -1):
-                alpha = int(200 * (radius/size))
-                glow_color = tuple(min(255, c + 100) for c in self.bowl_color)  # Brighter version
-                pygame.draw.circle(sparkle_surface, (*glow_color, alpha), (x, y), radius)
-        
-        # Add some shooting sparkles
-        for _ in range(10):
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.randint(30, 80)
-            x = WIDTH//2 + math.cos(angle) * distance
-            y = HEIGHT//2 + math.sin(angle) * distance
-            pygame.draw.circle(sparkle_surface, (255, 255, 255, 200), (int(x), int(y)), 2)
-        
-        return sparkle_surface
+        """Start the sparkle layer around the bowl (keeps running sparkles as they are)"""
+        self.sparkles.start()
 
     def update_animations(self, screen, game, dt):
         # Update error messages
@@ -267,67 +308,81 @@ class AnimationManager:
         should_show_disaster = self.disaster_timer > 0 and self.current_disaster
         
         self.update_bowl_color()
+
+        # Step every particle effect once per frame
+        with profiler.section("animations.particles"):
+            self.particles.step()
         
         # Handle disaster effects first
         if self.disaster_timer > 0:
-            # Create red overlay
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            pygame.draw.rect(overlay, (255, 0, 0, 128), overlay.get_rect())
-            screen.blit(overlay, (0, 0))
-            
-            # Update and draw the specific disaster effect
-            if self.current_disaster == "Oven malfunction":
-                self.update_oven_fire(screen)
-            elif self.current_disaster == "Power outage":
-                self.update_power_flicker(screen)
-            elif self.current_disaster == "Ingredient spill":
-                self.update_spill_particles(screen)
+            with profiler.section("animations.disaster"):
+                # The red overlay and effects cover the whole screen
+                tracker.mark_full()
+                # Create red overlay
+                overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+                pygame.draw.rect(overlay, (255, 0, 0, 128), overlay.get_rect())
+                screen.blit(overlay, (0, 0))
+
+                # Update and draw the specific disaster effect
+                if self.current_disaster == "Oven malfunction":
+                    self.update_oven_fire(screen)
+                elif self.current_disaster == "Power outage":
+                    self.update_power_flicker(screen, dt)
+                elif self.current_disaster == "Ingredient spill":
+                    self.update_spill_particles(screen)
         
         # Continue with regular animations
-        self.draw_mixing_bowl(screen, game)
+        with profiler.section("animations.bowl"):
+            self.draw_mixing_bowl(screen, game)
         
         # Update ingredient effects
-        if self.flour_clouds or self.sugar_crystals or self.liquid_droplets:
-            self.update_ingredient_effects(screen)
+        if self.particles.has(FLOUR, SUGAR, DROPLET):
+            with profiler.section("animations.effects"):
+                self.update_ingredient_effects(screen)
         
         # Handle animated ingredients
         if self.animated_ingredients:
-            completed = []
-            for i, ingredient in enumerate(self.animated_ingredients):
-                if ingredient.move():
-                    completed.append(i)
-                    if self.pending_color_transitions:
-                        new_color, ing_type = self.pending_color_transitions.pop(0)
-                        self.start_color_transition(new_color)
-                        if ing_type in self.ingredient_effects:
-                            self.ingredient_effects[ing_type]()
-                        self.bowl_fill_level += 0.1
-                        if self.bowl_fill_level > 1:
-                            self.bowl_fill_level = 1
-                else:
-                    ingredient.draw(screen)
-            
-            for i in reversed(completed):
-                self.animated_ingredients.pop(i)
-            
-            self.is_animating = bool(self.animated_ingredients)
+            with profiler.section("animations.ingredients"):
+                completed = []
+                for i, ingredient in enumerate(self.animated_ingredients):
+                    if ingredient.move():
+                        completed.append(i)
+                        if self.pending_color_transitions:
+                            new_color, ing_type = self.pending_color_transitions.pop(0)
+                            self.start_color_transition(new_color)
+                            if ing_type in self.ingredient_effects:
+                                self.ingredient_effects[ing_type]()
+                            self.bowl_fill_level += 0.1
+                            if self.bowl_fill_level > 1:
+                                self.bowl_fill_level = 1
+                    else:
+                        ingredient.draw(screen)
+
+                for i in reversed(completed):
+                    self.animated_ingredients.pop(i)
+
+                self.is_animating = bool(self.animated_ingredients)
         else:
             self.is_animating = False
 
         # Draw sparkle effects
         if self.color_transition:
-            sparkle_surface = self.add_sparkle_effect()
-            screen.blit(sparkle_surface, (0, 0))
+            with profiler.section("animations.sparkles"):
+                self.sparkles.update()
+                glow_color = tuple(min(255, c + 100) for c in ensure_rgb(self.bowl_color))  # Brighter version
+                self.sparkles.draw(screen, glow_color)
         
         # Draw error messages and disaster message last
-        self.draw_error_messages(screen)
-        self.draw_disaster_message(screen)
+        with profiler.section("animations.messages"):
+            self.draw_error_messages(screen)
+            self.draw_disaster_message(screen)
 
     def reset_bowl(self):
         """Reset the bowl fill level to zero and reset color"""
         self.bowl_fill_level = 0
         self.bowl_color = (200, 200, 200)
         self.color_transition = None
+        self.sparkles.stop()
         self.animated_ingredients.clear()
         self.is_animating = False
         self.previous_colors = []  # Clear color history
@@ -335,126 +390,10 @@ class AnimationManager:
     def draw_mixing_bowl(self, screen, game):
         bowl_color = BLUE if "Larger Bowl" in game.active_upgrades else DARK_GRAY
         bowl_size = 160 if "Larger Bowl" in game.active_upgrades else 150
-        
-        # Draw bowl glow with enhanced effect
-        glow_surface = pygame.Surface((bowl_size + 20, 150), pygame.SRCALPHA)
-        for r in range(10, 0, -1):
-            alpha = int(25 * r)
-            pygame.draw.ellipse(glow_surface, (*self.bowl_color, alpha), 
-                              (r, r, bowl_size + 20 - 2*r, 50 - r))
-        screen.blit(glow_surface, (WIDTH//2 - (bowl_size + 20)//2, HEIGHT//2 - 35))
-        
-        # Draw bowl outline with enhanced neon effect
-        for i in range(3):
-            alpha = 255 - i * 50
-            pygame.draw.ellipse(screen, (*bowl_color, alpha), 
-                              (WIDTH//2 - bowl_size//2 - i, HEIGHT//2 - 25 - i, 
-                               bowl_size + i*2, 50 + i*2), 2)
-        
-        # Draw liquid contents with dynamic effects
-        if self.bowl_fill_level > 0:
-            fill_height = int(max(self.bowl_fill_level, 0.1) * 100)
-            gradient_surface = pygame.Surface((bowl_size - 4, fill_height), pygame.SRCALPHA)
-            
-            # Create dynamic liquid effect
-            current_time = time.time()
-            
-            # Wave parameters
-            wave_speed = 2
-            wave_height = 3
-            num_waves = 3
-            
-            for y in range(fill_height):
-                progress = y / fill_height
-                
-                # Create multiple overlapping waves
-                wave_offset = 0
-                for i in range(num_waves):
-                    wave_offset += math.sin(current_time * wave_speed + y * 0.1 + i * 2) * wave_height
-                
-                # Adjust wave effect based on number of ingredients
-                wave_intensity = min(1.0, len(game.current_ingredients) * 0.2)
-                wave_offset *= wave_intensity
-                
-                # Base color with alpha
-                alpha = int(255 * (0.5 + 0.5 * progress))
-                base_color = self.bowl_color[:3]  # Ensure RGB only
-                glow_color = tuple(min(255, c + 50) for c in base_color)  # Brighter version
-                
-                # Create proper RGBA colors
-                base_rgba = (*base_color, alpha)
-                glow_rgba = (*glow_color, alpha)
-                
-                # Draw the liquid line with wave effect
-                x_offset = int(wave_offset)
-                pygame.draw.line(gradient_surface, base_rgba,
-                               (max(0, x_offset), y),
-                               (min(bowl_size - 4, bowl_size - 4 + x_offset), y))
-                
-                # Add bubbles with proper RGBA colors
-                if random.random() < 0.02 * wave_intensity:
-                    bubble_x = random.randint(10, bowl_size - 14)
-                    bubble_size = random.randint(2, 4)
-                    bubble_alpha = random.randint(100, 200)
-                    pygame.draw.circle(gradient_surface, (*glow_color, bubble_alpha),
-                                     (bubble_x, y), bubble_size)
-            
-            # Add dynamic swirl effects
-            swirl_time = current_time * 3
-            for i in range(3):
-                swirl_x = bowl_size//2 + math.cos(swirl_time + i*2) * 20
-                swirl_y = fill_height//2 + math.sin(swirl_time + i*2) * 10
-                swirl_color = (*glow_color, 150)
-                
-                # Draw swirl pattern
-                for angle in range(0, 360, 30):
-                    rad = math.radians(angle)
-                    end_x = swirl_x + math.cos(rad + swirl_time) * 10
-                    end_y = swirl_y + math.sin(rad + swirl_time) * 5
-                    if 0 <= end_x <= bowl_size-4 and 0 <= end_y <= fill_height:
-                        pygame.draw.line(gradient_surface, swirl_color,
-                                       (swirl_x, swirl_y), (end_x, end_y), 2)
-            
-            # Add magical sparkles
-            for _ in range(int(fill_height / 5)):
-                spark_x = random.randint(0, bowl_size - 4)
-                spark_y = random.randint(0, fill_height)
-                spark_size = random.randint(1, 3)
-                spark_alpha = random.randint(150, 255)
-                
-                # Draw star-shaped sparkle
-                for angle in range(0, 360, 45):
-                    rad = math.radians(angle)
-                    end_x = spark_x + math.cos(rad) * spark_size
-                    end_y = spark_y + math.sin(rad) * spark_size
-                    pygame.draw.line(gradient_surface, (255, 255, 255, spark_alpha),
-                                   (spark_x, spark_y), (end_x, end_y), 1)
-            
-            # Add color swirls when mixing
-            if self.color_transition:
-                transition_color = self.color_transition[1]
-                swirl_points = []
-                swirl_time = current_time * 2
-                for i in range(5):
-                    x = bowl_size//2 + math.cos(swirl_time + i) * (20 - i*3)
-                    y = fill_height//2 + math.sin(swirl_time + i) * (10 - i*2)
-                    swirl_points.append((x, y))
-                
-                if len(swirl_points) > 2:
-                    pygame.draw.lines(gradient_surface, (*transition_color, 200),
-                                    False, swirl_points, 3)
-            
-            # Blit the liquid to the screen
-            screen.blit(gradient_surface, 
-                       (WIDTH//2 - bowl_size//2 + 2, HEIGHT//2 + 73 - fill_height))
-            
-            # Add surface reflection
-            reflection_height = 10
-            reflection_surface = pygame.Surface((bowl_size - 4, reflection_height), pygame.SRCALPHA)
-            pygame.draw.ellipse(reflection_surface, (255, 255, 255, 30),
-                              (0, 0, bowl_size - 4, reflection_height * 2))
-            screen.blit(reflection_surface,
-                       (WIDTH//2 - bowl_size//2 + 2, HEIGHT//2 + 73 - fill_height))
+        transition_color = self.color_transition[1] if self.color_transition else None
+        self.bowl_renderer.draw(screen, bowl_size, bowl_color, ensure_rgb(self.bowl_color),
+                                self.bowl_fill_level, len(game.current_ingredients),
+                                transition_color)
 
     def draw_disaster_animations(self, screen):
         if self.spill_line:
@@ -492,15 +431,15 @@ class AnimationManager:
         self.spill_line = []
         self.power_flicker = False
         self.oven_fire = []
-        self.flame_particles = []
-        self.disaster_particles = []
-        self.flicker_count = 0
+        self.particles.kill([FLAME, SPILL])
+        self.flicker_time = 0
         self.current_disaster = None
         self.disaster_timer = 0
 
     def draw_disaster_message(self, screen):
         if not self.disaster_message or self.disaster_timer <= 0:
             return
+        tracker.mark_full()
             
         try:
             # Create semi-transparent overlay
@@ -509,8 +448,7 @@ class AnimationManager:
             screen.blit(overlay, (0, 0))
             
             # Create background for text
-            font = pygame.font.Font(None, 48)
-            text = font.render(self.disaster_message, True, WHITE[:3])
+            text = render_text(self.disaster_message, 48, WHITE[:3])
             
             # Add pulsing effect
             pulse = abs(math.sin(pygame.time.get_ticks() * 0.005)) * 0.2 + 0.8
@@ -541,238 +479,227 @@ class AnimationManager:
     
     def trigger_oven_fire_effect(self):
         # Create more flame particles that rise from bottom of screen
-        for _ in range(40):  # Increased from 20
-            x = random.randint(0, WIDTH)
-            y = HEIGHT + random.randint(0, 50)
-            speed = random.uniform(3, 7)  # Increased speed
-            size = random.randint(50, 120)  # Increased size
-            self.flame_particles.append({
-                'x': x, 'y': y,
-                'speed': speed,
-                'size': size,
-                'wobble': random.uniform(0, 2 * math.pi),
-                'intensity': random.uniform(0.8, 1.2)  # Variation in flame intensity
-            })
+        n = 40  # Increased from 20
+        self.particles.emit(
+            FLAME, n,
+            x=np.random.randint(0, WIDTH + 1, n),
+            y=HEIGHT + np.random.randint(0, 51, n),
+            dy=-np.random.uniform(3, 7, n),  # Increased speed
+            # Increased size, scaled by a variation in flame intensity
+            size=np.random.randint(50, 121, n) * np.random.uniform(0.8, 1.2, n),
+            phase=np.random.uniform(0, 2 * math.pi, n),  # Wobble
+            phase_speed=0.1,
+        )
 
     def update_oven_fire(self, screen):
-        if self.flame_particles:
+        """Draw the flame particles stepped by the particle pool"""
+        flames = self.particles.indices(FLAME)
+        if flames.size:
             # Create an overlay for the heat distortion effect
             overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
             overlay.fill((255, 50, 0, 30))  # Red tint with alpha
             screen.blit(overlay, (0, 0))
+
+            xs = (self.particles.x[flames] + np.sin(self.particles.phase[flames]) * 20).tolist()
+            ys = self.particles.y[flames].tolist()
+            sizes = self.particles.size[flames].tolist()
             
-            for flame in self.flame_particles[:]:
-                flame['y'] -= flame['speed']
-                flame['wobble'] += 0.1
-                x = flame['x'] + math.sin(flame['wobble']) * 20
-                
-                # Enhanced flame gradient with proper RGBA tuples
-                colors = [
-                    (255, 50, 0, 200),    # Red
-                    (255, 150, 0, 180),   # Orange
-                    (255, 200, 0, 160),   # Yellow
-                    (255, 255, 200, 140)  # White-yellow core
-                ]
-                
+            # Enhanced flame gradient with proper RGBA tuples
+            colors = [
+                (255, 50, 0, 200),    # Red
+                (255, 150, 0, 180),   # Orange
+                (255, 200, 0, 160),   # Yellow
+                (255, 255, 200, 140)  # White-yellow core
+            ]
+
+            # Every flame layer comes from the stamp cache and the whole fire is one blits call
+            batch = []
+            for x, y, flame_size in zip(xs, ys, sizes):
                 for i, color in enumerate(colors):
-                    size = flame['size'] * (1 - i * 0.2) * flame['intensity']
-                    surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-                    pygame.draw.ellipse(surf, color, (0, 0, size * 2, size * 2))
-                    screen.blit(surf, (x - size, flame['y'] - size))
-                
-                if flame['y'] < -100:
-                    self.flame_particles.remove(flame)
+                    stamp = circle_stamp(flame_size * (1 - i * 0.2), color, color[3])
+                    size = stamp.get_width() // 2
+                    batch.append((stamp, (x - size, y - size)))
+            blit_stamps(screen, batch)
 
     def trigger_power_flicker_effect(self):
-        self.flicker_count = 30  # More flickers
+        self.flicker_time = 0.5  # Half a second of flickers
         self.flicker_intensity = random.uniform(0.5, 1.0)
 
-    def update_power_flicker(self, screen):
-        if self.flicker_count > 0:
-            if self.flicker_count % 2 == 0:
+    def update_power_flicker(self, screen, dt):
+        if self.flicker_time > 0:
+            # Alternate light and dark every 1/60th of a second, whatever the frame rate
+            if int(self.flicker_time * 60) % 2 == 0:
                 intensity = int(255 * self.flicker_intensity)
                 screen.fill((intensity, intensity, intensity))
             else:
                 screen.fill((0, 0, 0))
-            self.flicker_count -= 1
+            self.flicker_time -= dt
 
     def trigger_spill_effect(self, num_particles=30):
         bowl_center = (WIDTH//2, HEIGHT//2)
+        n = num_particles
         
-        for _ in range(num_particles):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(8, 20)
-            size = random.randint(30, 70)
-            # Ensure RGB format for bowl color
-            color = (self.bowl_color[:3] if len(self.bowl_color) > 3 else self.bowl_color) if self.bowl_color != (200, 200, 200) else random.choice([c[:3] if len(c) > 3 else c for c in INGREDIENT_COLORS.values()])
-            
-            self.disaster_particles.append({
-                'x': bowl_center[0],
-                'y': bowl_center[1],
-                'dx': math.cos(angle) * speed,
-                'dy': math.sin(angle) * speed - 8,
-                'size': size,
-                'color': color,
-                'gravity': 0.4,
-                'squish': 1.0,
-                'rotation': random.uniform(0, 360),
-                'spin': random.uniform(-5, 5)
-            })
+        angle = np.random.uniform(0, 2 * math.pi, n)
+        speed = np.random.uniform(8, 20, n)
+        # Ensure RGB format for bowl color
+        if self.bowl_color != (200, 200, 200):
+            color = ensure_rgb(self.bowl_color)
+        else:
+            palette = np.array(INGREDIENTS.colors)
+            color = palette[np.random.randint(0, len(palette), n)]
+        
+        self.particles.emit(
+            SPILL, n,
+            x=bowl_center[0], y=bowl_center[1],
+            dx=np.cos(angle) * speed,
+            dy=np.sin(angle) * speed - 8,
+            gravity=0.4,
+            size=np.random.randint(30, 71, n),
+            color=color,
+            rotation=np.random.uniform(0, 360, n),
+            spin=np.random.uniform(-5, 5, n),
+        )
 
     def update_spill_particles(self, screen):
-        if self.disaster_particles:
-            for particle in self.disaster_particles[:]:
-                # Update position with more dynamic movement
-                particle['x'] += particle['dx']
-                particle['dy'] += particle['gravity']
-                particle['y'] += particle['dy']
-                particle['rotation'] += particle['spin']
-                
-                # Enhanced squish effect when hitting bottom
-                if particle['y'] + particle['size'] > HEIGHT:
-                    particle['dy'] *= -0.6
-                    particle['dx'] *= 0.8
-                    particle['squish'] = 0.5
-                    particle['spin'] *= 0.8
-                else:
-                    particle['squish'] = max(0.8, particle['squish'] + 0.05)
-                
-                # Draw blob with rotation and proper RGBA
-                size_x = particle['size'] * 2
-                size_y = particle['size'] * 2 * particle['squish']
-                surf = pygame.Surface((size_x, size_y), pygame.SRCALPHA)
-                
-                # Draw main blob with alpha
-                color = (*particle['color'][:3], 200)  # Ensure RGB + alpha
-                pygame.draw.ellipse(surf, color, (0, 0, size_x, size_y))
-                
-                # Rotate and draw
-                rotated_surf = pygame.transform.rotate(surf, particle['rotation'])
-                screen.blit(rotated_surf, (particle['x'] - rotated_surf.get_width()//2,
-                                         particle['y'] - rotated_surf.get_height()//2))
-                
-                if particle['y'] > HEIGHT + 100:
-                    self.disaster_particles.remove(particle)
+        """Draw the spill blobs stepped by the particle pool"""
+        blobs = self.particles.indices(SPILL)
+        p = self.particles
+        batch = []
+        for x, y, size, squish, rotation, color in zip(
+                p.x[blobs].tolist(), p.y[blobs].tolist(), p.size[blobs].tolist(),
+                p.squish[blobs].tolist(), p.rotation[blobs].tolist(), p.color[blobs].tolist()):
+            # Rotated blob with alpha comes from the bucketed rotation cache
+            rotated_surf = rotated_blob_stamp(size, squish, color, 200, rotation)
+            batch.append((rotated_surf, (x - rotated_surf.get_width()//2,
+                                         y - rotated_surf.get_height()//2)))
+        blit_stamps(screen, batch)
 
     def add_flour_effect(self):
         # Create flour puff cloud
-        for _ in range(10):
-            self.flour_clouds.append({
-                'x': WIDTH//2 + random.randint(-30, 30),
-                'y': HEIGHT//2 + random.randint(-10, 10),
-                'size': random.randint(10, 20),
-                'alpha': 255,
-                'fade_speed': random.uniform(2, 4)
-            })
+        n = 10
+        self.particles.emit(
+            FLOUR, n,
+            x=WIDTH//2 + np.random.randint(-30, 31, n),
+            y=HEIGHT//2 + np.random.randint(-10, 11, n),
+            size=np.random.randint(10, 21, n),
+            fade=np.random.uniform(2, 4, n),
+        )
 
     def add_sugar_effect(self):
         # Create sparkly crystallization effect
-        for _ in range(15):
-            self.sugar_crystals.append({
-                'x': WIDTH//2 + random.randint(-40, 40),
-                'y': HEIGHT//2 + random.randint(-20, 20),
-                'size': random.randint(1, 3),
-                'sparkle_time': 0,
-                'lifetime': random.randint(30, 60)
-            })
+        n = 15
+        self.particles.emit(
+            SUGAR, n,
+            x=WIDTH//2 + np.random.randint(-40, 41, n),
+            y=HEIGHT//2 + np.random.randint(-20, 21, n),
+            size=np.random.randint(1, 4, n),
+            phase_speed=1,  # Sparkle time
+            life=np.random.randint(30, 61, n),
+        )
 
     def add_egg_effect(self):
         # Create egg crack and splash effect
-        center_x = WIDTH//2
-        center_y = HEIGHT//2
-        for _ in range(20):
-            angle = random.uniform(0, math.pi)  # Upper half circle
-            speed = random.uniform(2, 5)
-            self.liquid_droplets.append({
-                'x': center_x,
-                'y': center_y,
-                'dx': math.cos(angle) * speed,
-                'dy': -math.sin(angle) * speed,
-                'size': random.randint(2, 4),
-                'color': (255, 250, 220),  # Egg yolk color
-                'gravity': 0.2,
-                'lifetime': 30
-            })
+        n = 20
+        angle = np.random.uniform(0, math.pi, n)  # Upper half circle
+        speed = np.random.uniform(2, 5, n)
+        self.particles.emit(
+            DROPLET, n,
+            x=WIDTH//2, y=HEIGHT//2,
+            dx=np.cos(angle) * speed,
+            dy=-np.sin(angle) * speed,
+            size=np.random.randint(2, 5, n),
+            color=(255, 250, 220),  # Egg yolk color
+            gravity=0.2,
+            life=30,
+        )
 
     def add_liquid_effect(self):
         # Create liquid splash effect
-        for _ in range(15):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(1, 3)
-            self.liquid_droplets.append({
-                'x': WIDTH//2 + random.randint(-20, 20),
-                'y': HEIGHT//2,
-                'dx': math.cos(angle) * speed,
-                'dy': math.sin(angle) * speed,
-                'size': random.randint(2, 5),
-                'color': self.bowl_color,
-                'gravity': 0.1,
-                'lifetime': 40
-            })
+        n = 15
+        angle = np.random.uniform(0, math.pi * 2, n)
+        speed = np.random.uniform(1, 3, n)
+        self.particles.emit(
+            DROPLET, n,
+            x=WIDTH//2 + np.random.randint(-20, 21, n),
+            y=HEIGHT//2,
+            dx=np.cos(angle) * speed,
+            dy=np.sin(angle) * speed,
+            size=np.random.randint(2, 6, n),
+            color=ensure_rgb(self.bowl_color),
+            gravity=0.1,
+            life=40,
+        )
 
     def add_butter_effect(self):
         # Create melting butter effect with golden droplets
-        for _ in range(12):
-            self.liquid_droplets.append({
-                'x': WIDTH//2 + random.randint(-30, 30),
-                'y': HEIGHT//2 - 20,
-                'dx': random.uniform(-0.5, 0.5),
-                'dy': random.uniform(0.5, 1.5),
-                'size': random.randint(3, 6),
-                'color': (255, 220, 100),  # Golden color
-                'gravity': 0.05,
-                'lifetime': 50
-            })
+        n = 12
+        self.particles.emit(
+            DROPLET, n,
+            x=WIDTH//2 + np.random.randint(-30, 31, n),
+            y=HEIGHT//2 - 20,
+            dx=np.random.uniform(-0.5, 0.5, n),
+            dy=np.random.uniform(0.5, 1.5, n),
+            size=np.random.randint(3, 7, n),
+            color=(255, 220, 100),  # Golden color
+            gravity=0.05,
+            life=50,
+        )
 
     def update_ingredient_effects(self, screen):
-        # Update flour clouds
-        for cloud in self.flour_clouds[:]:
-            cloud['alpha'] = max(0, int(cloud['alpha'] - cloud['fade_speed']))
-            if cloud['alpha'] <= 0:
-                self.flour_clouds.remove(cloud)
-            else:
-                surf = pygame.Surface((cloud['size'] * 2, cloud['size'] * 2), pygame.SRCALPHA)
-                pygame.draw.circle(surf, (255, 255, 255, cloud['alpha']),
-                                (cloud['size'], cloud['size']), cloud['size'])
-                screen.blit(surf, (cloud['x'] - cloud['size'], cloud['y'] - cloud['size']))
-
-        # Update sugar crystals
-        for crystal in self.sugar_crystals[:]:
-            crystal['sparkle_time'] += 1
-            if crystal['sparkle_time'] >= crystal['lifetime']:
-                self.sugar_crystals.remove(crystal)
-            else:
-                sparkle_alpha = int(255 * abs(math.sin(crystal['sparkle_time'] * 0.2)))
-                color = (*self.bowl_color, sparkle_alpha)  # Create proper RGBA tuple
-                pygame.draw.circle(screen, color, 
-                                (int(crystal['x']), int(crystal['y'])), 
-                                crystal['size'])
-
-        # Update liquid droplets
-        for drop in self.liquid_droplets[:]:
-            drop['x'] += drop['dx']
-            drop['dy'] += drop['gravity']
-            drop['y'] += drop['dy']
-            drop['lifetime'] -= 1
-            
-            if drop['lifetime'] <= 0:
-                self.liquid_droplets.remove(drop)
-            else:
-                alpha = int(255 * (drop['lifetime'] / 40))
-                # Ensure color is RGB before adding alpha
-                base_color = drop['color'][:3] if len(drop['color']) > 3 else drop['color']
-                color = (*base_color, alpha)  # Create proper RGBA tuple
-                pygame.draw.circle(screen, color,
-                                (int(drop['x']), int(drop['y'])), drop['size'])
-
-def flash_screen_red(screen):
-    for _ in range(3):  # Flash 3 times
-        screen.fill(RED)
-        pygame.display.flip()
-        pygame.time.delay(200)
-        screen.fill(WHITE)
-        pygame.display.flip()
-        pygame.time.delay(200)
+        """Draw flour clouds, sugar crystals and droplets stepped by the particle pool"""
+        p = self.particles
+
+        batch = []
+
+        # Flour clouds
+        clouds = p.indices(FLOUR)
+        for x, y, size, alpha in zip(p.x[clouds].astype(int).tolist(), p.y[clouds].astype(int).tolist(),
+                                     p.size[clouds].tolist(), p.alpha[clouds].tolist()):
+            stamp = circle_stamp(size, WHITE, alpha)
+            radius = stamp.get_width() // 2
+            batch.append((stamp, (x - radius, y - radius)))
+
+        # Sugar crystals in the current bowl color
+        crystals = p.indices(SUGAR)
+        sparkle_alpha = 255 * np.abs(np.sin(p.phase[crystals] * 0.2))
+        bowl_rgb = ensure_rgb(self.bowl_color)
+        for x, y, size, alpha in zip(p.x[crystals].astype(int).tolist(), p.y[crystals].astype(int).tolist(),
+                                     p.size[crystals].astype(int).tolist(), sparkle_alpha.tolist()):
+            stamp = circle_stamp(size, bowl_rgb, alpha)
+            batch.append((stamp, (x - size, y - size)))
+
+        # Liquid droplets
+        drops = p.indices(DROPLET)
+        drop_alpha = np.clip(255 * p.life[drops] / 40, 0, 255)
+        for x, y, size, color, alpha in zip(p.x[drops].astype(int).tolist(), p.y[drops].astype(int).tolist(),
+                                            p.size[drops].astype(int).tolist(), p.color[drops].tolist(),
+                                            drop_alpha.tolist()):
+            stamp = circle_stamp(size, color, alpha)
+            batch.append((stamp, (x - size, y - size)))
+
+        # The whole effect layer is drawn with a single blits call
+        tracker.mark_all(blit_stamps(screen, batch, doreturn=True))
+
+class ScreenFlash:
+    """Full-screen red/white flashing that advances with the frame clock instead of blocking"""
+
+    def __init__(self, colors=(RED, WHITE), flashes=3, interval=0.2):
+        # Flash 3 times, each color held for interval seconds
+        self.timeline = list(colors) * flashes
+        self.interval = interval
+        self.elapsed = 0
+
+    def update(self, dt):
+        self.elapsed += dt
+
+    def draw(self, screen):
+        step = int(self.elapsed / self.interval)
+        if step < len(self.timeline):
+            screen.fill(self.timeline[step])
+            tracker.mark_full()
+
+    def is_finished(self):
+        return self.elapsed >= self.interval * len(self.timeline)
 
 class PopupText:
     def __init__(self, text, x, y):
@@ -780,7 +707,7 @@ class PopupText:
         self.x = x
         self.y = y
         self.alpha = 255
-        self.font = pygame.font.Font(None, 48)
+        self.font = get_font(48)
         self.fade_speed = 5
 
     def update(self):
@@ -788,8 +715,8 @@ class PopupText:
         self.y -= 1
 
     def draw(self, screen):
-        # Create main text surface with proper color handling
-        text_surface = self.font.render(self.text, True, (255, 255, 255))
+        # Copy the shared cached rendering since the alpha fade is applied in place
+        text_surface = render_text(self.text, 48, (255, 255, 255)).copy()
         
         # Create semi-transparent background with padding
         padding = 20
@@ -813,8 +740,8 @@ class PopupText:
         text_surface.blit(alpha_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
         
         # Draw background and text
-        screen.blit(bg_surface, (bg_x, bg_y))
-        screen.blit(text_surface, (text_x, text_y))
+        tracker.mark(screen.blit(bg_surface, (bg_x, bg_y)))
+        tracker.mark(screen.blit(text_surface, (text_x, text_y)))
 
     def is_finished(self):
         return self.alpha <= 0
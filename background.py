@@ -2,81 +2,132 @@ import pygame
 import math
 import random
 from config import WIDTH, HEIGHT
+from dirty_rects import tracker
 
 class Background:
     def __init__(self):
-        self.surface = pygame.Surface((WIDTH, HEIGHT))
         self.grid_size = 40
         self.perspective_points = []
+        self.perspective_size = None  # Size the perspective points were generated for
         self.generate_perspective_grid()
         self.stars = [(random.randint(0, WIDTH), random.randint(0, HEIGHT)) 
                      for _ in range(100)]
         self.time = 0
+        # Gradient, grid and fog never change, so they are baked once and only
+        # rebuilt when the target resolution changes. static_layer has all three;
+        # the separate layers let stars be recomposited under the grid and fog.
+        self.static_layer = None
+        self.static_layer_size = None
+        self.base_layer = None
+        self.grid_layer = None
+        self.fog_layer = None
+        self.star_patches = None  # Merged screen areas around the stars, rebuilt when one moves
         
-    def generate_perspective_grid(self):
+    def generate_perspective_grid(self, width=WIDTH, height=HEIGHT):
+        self.perspective_points = []
+        self.perspective_size = (width, height)
+
         # Create vanishing point
-        vanishing_x = WIDTH // 2
-        vanishing_y = HEIGHT // 2
+        vanishing_x = width // 2
+        vanishing_y = height // 2
         
         # Generate grid points with perspective
-        for x in range(0, WIDTH + self.grid_size, self.grid_size):
-            for y in range(0, HEIGHT + self.grid_size, self.grid_size):
+        for x in range(0, width + self.grid_size, self.grid_size):
+            for y in range(0, height + self.grid_size, self.grid_size):
                 # Calculate perspective displacement
                 dx = x - vanishing_x
                 dy = y - vanishing_y
                 distance = math.sqrt(dx*dx + dy*dy)
-                perspective = 0.5 + distance / (WIDTH + HEIGHT)
+                perspective = 0.5 + distance / (width + height)
                 
                 x_pos = vanishing_x + dx * perspective
                 y_pos = vanishing_y + dy * perspective
                 
                 self.perspective_points.append((x_pos, y_pos))
 
+    def build_static_layer(self, size):
+        """Render the gradient, perspective grid and fog into cached surfaces"""
+        width, height = size
+        if self.perspective_size != (width, height):
+            self.generate_perspective_grid(width, height)
+
+        base = pygame.Surface((width, height))
+        base.fill((10, 12, 20))
+        
+        # Draw subtle gradient
+        gradient_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        for y in range(height):
+            alpha = int(25 * (1 - y/height))  # Fade from bottom to top
+            pygame.draw.line(gradient_surface, (30, 35, 50, alpha), (0, y), (width, y))
+        base.blit(gradient_surface, (0, 0))
+        layer = base.copy()
+        
+        # Draw perspective grid with transparency
+        grid_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        points = self.perspective_points
+        for i in range(len(points)):
+            start = points[i]
+            # Only the next few points are ever connected, no need for a full pair scan
+            for j in range(i + 1, min(i + 10, len(points))):
+                end = points[j]
+                # Calculate distance-based alpha
+                distance = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
+                if distance < 100:  # Only draw nearby connections
+                    alpha = int(50 * (1 - distance/100))
+                    pygame.draw.line(grid_surface, (50, 55, 70, alpha), start, end, 1)
+        layer.blit(grid_surface, (0, 0))
+        
+        # Add fog effect with proper alpha blending
+        fog_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        for y in range(height):
+            alpha = int(5 + 20 * (y/height))  # More fog at bottom
+            pygame.draw.line(fog_surface, (20, 25, 35, alpha), (0, y), (width, y))
+        layer.blit(fog_surface, (0, 0))
+
+        self.static_layer = layer
+        self.static_layer_size = (width, height)
+        self.base_layer = base
+        self.grid_layer = grid_surface
+        self.fog_layer = fog_surface
+
     def update(self):
         self.time += 0.01
         # Update star positions for twinkling effect
         for i in range(len(self.stars)):
             if random.random() < 0.01:  # 1% chance to move each star
                 self.stars[i] = (random.randint(0, WIDTH), random.randint(0, HEIGHT))
+                self.star_patches = None
+
+    def merge_star_patches(self):
+        """3x3 areas around the stars, overlapping ones merged so no pixel is in two patches"""
+        patches = []
+        for x, y in self.stars:
+            rect = pygame.Rect(x - 1, y - 1, 3, 3)
+            i = rect.collidelist(patches)
+            while i != -1:
+                rect.union_ip(patches.pop(i))
+                i = rect.collidelist(patches)
+            patches.append(rect)
+        return patches
 
     def draw(self, screen):
-        # Fill background with dark color
-        self.surface.fill((10, 12, 20))
-        
-        # Draw subtle gradient
-        gradient_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        for y in range(HEIGHT):
-            alpha = int(25 * (1 - y/HEIGHT))  # Fade from bottom to top
-            pygame.draw.line(gradient_surface, (30, 35, 50, alpha), (0, y), (WIDTH, y))
-        self.surface.blit(gradient_surface, (0, 0))
+        size = screen.get_size()
+        if self.static_layer is None or self.static_layer_size != size:
+            self.build_static_layer(size)
+            tracker.mark_full()
+
+        # Start from the cached static layers
+        screen.blit(self.static_layer, (0, 0))
         
-        # Draw twinkling stars
+        # Twinkling stars sit under the grid and fog: only the areas around them are
+        # taken back to the gradient, given their stars and covered by grid and fog again
+        if self.star_patches is None:
+            self.star_patches = self.merge_star_patches()
+        patches = self.star_patches
+        screen.blits([(self.base_layer, patch, patch) for patch in patches], doreturn=False)
         for star in self.stars:
             brightness = int(128 + 127 * math.sin(self.time + hash(star) % 360))
-            pygame.draw.circle(self.surface, (brightness, brightness, brightness), star, 1)
-        
-        # Draw perspective grid with transparency
-        grid_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        for i in range(len(self.perspective_points)):
-            for j in range(i + 1, len(self.perspective_points)):
-                if abs(i - j) < 10:  # Limit connections for performance
-                    start = self.perspective_points[i]
-                    end = self.perspective_points[j]
-                    # Calculate distance-based alpha
-                    distance = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
-                    if distance < 100:  # Only draw nearby connections
-                        alpha = int(50 * (1 - distance/100))
-                        pygame.draw.line(grid_surface, (50, 55, 70, alpha), start, end, 1)
-        
-        self.surface.blit(grid_surface, (0, 0))
-        
-        # Add fog effect with proper alpha blending
-        fog_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        for y in range(HEIGHT):
-            alpha = int(5 + 20 * (y/HEIGHT))  # More fog at bottom
-            pygame.draw.line(fog_surface, (20, 25, 35, alpha), (0, y), (WIDTH, y))
-        
-        self.surface.blit(fog_surface, (0, 0))
-        
-        # Finally, blit the complete background to the screen
-        screen.blit(self.surface, (0, 0)) 
\ No newline at end of file
+            pygame.draw.circle(screen, (brightness, brightness, brightness), star, 1)
+        screen.blits([(self.grid_layer, patch, patch) for patch in patches], doreturn=False)
+        screen.blits([(self.fog_layer, patch, patch) for patch in patches], doreturn=False)
+        tracker.mark_all(patches)
@@ -5,15 +5,19 @@ from drawing_utils import draw_pentagon, draw_hexagon, draw_ingredients, draw_re
 from game_logic import handle_baking_process, generate_customer_order, trigger_kitchen_disaster
 from ui import draw_intro_screen, handle_dialogue, draw_recipe_book_screen
 from config import WIDTH, HEIGHT, WHITE, BLACK
-from animation import AnimationManager, flash_screen_red, PopupText
+from animation import AnimationManager, ScreenFlash, PopupText
 from background import Background
+from font_cache import clear_cache, cached_text_count
+from dirty_rects import tracker
+from profiler import profiler
 import os
 
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"  # Hide Pygame welcome message
-os.environ['SDL_VIDEODRIVER'] = 'cocoa'  # For MacOS
 os.environ['SDL_VIDEO_X11_NET_WM_BYPASS_COMPOSITOR'] = '0'  # Helps with compositing
 
 if sys.platform == 'darwin':  # Fixed: using sys.platform instead of os.platform
+    # SDL picks cocoa on macOS by itself; an SDL_VIDEODRIVER from the environment (e.g. dummy) still wins
+    os.environ.setdefault('SDL_VIDEODRIVER', 'cocoa')
     os.environ['NSSupportsAutomaticGraphicsSwitching'] = 'True'
 
 # Main game loop and high-level logic
@@ -28,16 +32,26 @@ def handle_events(game, animation_manager):
             handle_keydown(event, game)
         elif event.type == pygame.MOUSEBUTTONDOWN:
             handle_mouse_click(event, game, animation_manager)
+        elif event.type == pygame.MOUSEWHEEL and game.state == "main_game":
+            game.shelf.scroll(-event.y)
     return True
 
 def handle_keydown(event, game):
     print(f"Key pressed: {pygame.key.name(event.key)}, Game state: {game.state}, Baking: {game.baking}")  # Debug print
-    if game.state == "main_game":
+    if event.key == pygame.K_F3:
+        profiler.toggle()
+    elif event.key == pygame.K_F4 and profiler.trace:
+        print("Frame profile written to {} and {}".format(*profiler.export()))
+    elif game.state == "main_game":
         if event.key == pygame.K_RETURN and not game.baking and len(game.current_ingredients) > 0:
             print("Starting baking process...")  # Debug print
             game.baking = True  # Only set the flag here, don't process baking
         elif event.key == pygame.K_r:
             game.replenish_ingredients()
+        elif event.key == pygame.K_PAGEDOWN:
+            game.shelf.scroll(1)
+        elif event.key == pygame.K_PAGEUP:
+            game.shelf.scroll(-1)
     elif game.state == "intro":
         if event.key == pygame.K_RETURN:
             game.state = "choose_difficulty"
@@ -48,6 +62,9 @@ def handle_keydown(event, game):
             print(f"Difficulty chosen: {game.difficulty}")  # Debug print
 
 def handle_mouse_click(event, game, animation_manager):
+    # A wheel notch also arrives as a button 4-7 press at the cursor; only left clicks count
+    if event.button != pygame.BUTTON_LEFT:
+        return
     if game.state == "main_game":
         x, y = event.pos
         
@@ -64,6 +81,8 @@ def handle_mouse_click(event, game, animation_manager):
         if y >= HEIGHT - 50:
             if game.purchase_upgrade(event.pos):
                 print("Upgrade purchased!")  # Debug print
+        elif game.shelf.handle_pager_click(x, y):
+            return
         else:
             ing, start_x, start_y = game.handle_ingredient_click(x, y)
             if ing:
@@ -106,8 +125,7 @@ def main():
         background = Background()
         clock = pygame.time.Clock()
         popup_text = None
-        disaster_duration = 3  # seconds
-        disaster_timer = 0
+        screen_flash = None
     except Exception as e:
         print(f"Failed to initialize game objects: {e}")
         pygame.quit()
@@ -117,46 +135,46 @@ def main():
     running = True
     while running:
         dt = clock.tick(60) / 1000.0  # Convert to seconds
+        profiler.begin_frame()
         
         try:
-            running = handle_events(game, animation_manager)
+            with profiler.section("events"):
+                running = handle_events(game, animation_manager)
             if not running:
                 break
 
-            background.update()
-            background.draw(screen)
+            with profiler.section("background.update"):
+                background.update()
+            with profiler.section("background.draw"):
+                background.draw(screen)
 
             if game.state == "intro":
                 draw_intro_screen(screen)
+                tracker.mark_full()
             elif game.state == "choose_difficulty":
                 handle_dialogue(screen, game)
+                tracker.mark_full()
             elif game.state == "main_game":
-                game.update()
-                
-                if game.kitchen_disaster:
-                    if disaster_timer == 0:
-                        animation_manager.trigger_disaster_animation(game.kitchen_disaster, game)
-                        ingredients_affected = game.handle_disaster_animation(animation_manager)
-                        if ingredients_affected:
-                            flash_screen_red(screen)
-                            game.current_ingredients.clear()
-                            animation_manager.reset_bowl()
-                        disaster_timer = disaster_duration
-                    else:
-                        disaster_timer -= dt
-                        if disaster_timer <= 0:
-                            disaster_timer = 0
-                            game.kitchen_disaster = None
-                            animation_manager.clear_disaster_animations()
-
-                if game.baking:  # Handle baking process only here
-                    result, bakecoin_change = game.handle_baking_process()
-                    popup_text = PopupText(result, WIDTH // 2, HEIGHT // 2)
-                    game.baking = False
-                    print(f"Baking complete. Result: {result}, Bakecoin change: {bakecoin_change}")  # Debug print
-
-                draw_game(screen, game, animation_manager, dt)
-                update_bakecoin_display(screen, game)
+                with profiler.section("game.update"):
+                    game.update(dt)
+
+                    # Combination discoveries made while clicking ingredients
+                    if game.discovery_messages and not popup_text:
+                        popup_text = PopupText(game.discovery_messages.pop(0), WIDTH // 2, HEIGHT // 2)
+
+                    if game.update_disaster(dt):
+                        screen_flash = ScreenFlash()
+
+                    if game.baking:  # Handle baking process only here
+                        result, bakecoin_change = game.handle_baking_process()
+                        popup_text = PopupText(result, WIDTH // 2, HEIGHT // 2)
+                        game.baking = False
+                        print(f"Baking complete. Result: {result}, Bakecoin change: {bakecoin_change}")  # Debug print
+
+                with profiler.section("draw_game"):
+                    draw_game(screen, game, animation_manager, dt)
+                with profiler.section("hud"):
+                    update_bakecoin_display(screen, game)
 
                 if popup_text:
                     popup_text.update()
@@ -164,7 +182,22 @@ def main():
                     if popup_text.is_finished():
                         popup_text = None
 
-            pygame.display.flip()
+                if screen_flash:
+                    screen_flash.update(dt)
+                    screen_flash.draw(screen)
+                    if screen_flash.is_finished():
+                        screen_flash = None
+
+            profiler.draw_overlay(screen)
+
+            with profiler.section("present"):
+                tracker.present(screen)
+            if profiler.enabled:
+                profiler.end_frame(particles=len(animation_manager.particles),
+                                   flying=len(animation_manager.animated_ingredients),
+                                   sprites=len(game.ingredient_sprites),
+                                   texts=cached_text_count(),
+                                   dirty_rects=len(tracker.last_rects))
 
         except Exception as e:
             print(f"Error in game loop: {e}")
@@ -173,6 +206,7 @@ def main():
 
     # Cleanup
     try:
+        clear_cache()
         pygame.font.quit()
         pygame.quit()
     except:
@@ -0,0 +1,330 @@
+"""Headless benchmarks for the rendering and game-logic hot paths.
+
+Every benchmark runs against the dummy SDL video driver, so the suite works
+on machines without a display. Results are written as JSON and can be
+compared against a saved baseline; a benchmark whose median time grew by
+more than --threshold is reported as a regression and the command exits 1.
+
+    python bench.py run --out bench_baseline.json             # record a baseline
+    python bench.py run --out bench.json --compare bench_baseline.json
+    python bench.py compare bench_baseline.json bench.json --threshold 0.2
+    python bench.py list
+
+Timings depend on the machine, so compare only results taken on the same one.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import numpy as np
+import pygame
+from config import WIDTH, HEIGHT
+
+SEED = 1234
+BOWL = ["Flour", "Sugar", "Eggs", "Butter", "Milk", "Cocoa", "Vanilla", "Baking Powder"]
+DISASTERS = {
+    "oven_fire": "Oven malfunction",
+    "power_flicker": "Power outage",
+    "spill": "Ingredient spill",
+}
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Register a setup function: it builds the scene and returns (run, operations per run)"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+def new_game(bowl=()):
+    from animation import AnimationManager
+    from game_state import Game
+    animation_manager = AnimationManager()
+    game = Game(animation_manager)
+    game.start("Normal")
+    for ing in bowl:
+        game.use_ingredient(ing)
+    return game, animation_manager
+
+@benchmark("background.draw")
+def bench_background(screen):
+    from background import Background
+    background = Background()
+
+    def run():
+        background.update()
+        background.draw(screen)
+    return run, 1
+
+@benchmark("animation.draw_mixing_bowl")
+def bench_mixing_bowl(screen):
+    game, animation_manager = new_game(BOWL)
+    animation_manager.bowl_fill_level = 0.8
+    animation_manager.bowl_color = (180, 120, 60)
+    return lambda: animation_manager.draw_mixing_bowl(screen, game), 1
+
+def disaster_scene(disaster, warmup_frames):
+    """A fully loaded bowl hit by disaster, stepped to the frame with the most particles on screen"""
+    game, animation_manager = new_game(BOWL * 2)
+    animation_manager.trigger_disaster_animation(disaster, game)
+    for _ in range(warmup_frames):
+        animation_manager.particles.step()
+    return game, animation_manager
+
+@benchmark("disaster.oven_fire")
+def bench_oven_fire(screen):
+    # Flames start below the screen and have risen into full view after about a second
+    _, animation_manager = disaster_scene(DISASTERS["oven_fire"], 60)
+    return lambda: animation_manager.update_oven_fire(screen), 1
+
+@benchmark("disaster.power_flicker")
+def bench_power_flicker(screen):
+    _, animation_manager = disaster_scene(DISASTERS["power_flicker"], 0)
+
+    def run():
+        animation_manager.flicker_time = 0.5
+        animation_manager.update_power_flicker(screen, 1 / 60)
+    return run, 1
+
+@benchmark("disaster.spill")
+def bench_spill(screen):
+    # Blobs leave the bowl together and are spread out but still on screen a few frames later
+    _, animation_manager = disaster_scene(DISASTERS["spill"], 8)
+    return lambda: animation_manager.update_spill_particles(screen), 1
+
+@benchmark("draw_game.full_bowl")
+def bench_draw_game(screen):
+    from drawing_utils import draw_game, update_bakecoin_display
+    game, animation_manager = new_game(BOWL * 2)
+    animation_manager.bowl_fill_level = 1.0
+    animation_manager.bowl_color = (180, 120, 60)
+
+    def run():
+        draw_game(screen, game, animation_manager, 1 / 60)
+        update_bakecoin_display(screen, game)
+    return run, 1
+
+@benchmark("recipes.match_10k")
+def bench_recipe_matching(screen, recipes=10000, ingredients=500):
+    """Fill and empty a bowl against a synthetic catalog of 10,000 recipes over 500 ingredients"""
+    from recipe_candidates import RecipeCandidates
+    rng = random.Random(SEED)
+    candidates = RecipeCandidates()
+    for i in range(recipes):
+        candidates.add_recipe(f"Recipe {i}", [rng.randrange(ingredients) for _ in range(rng.randint(3, 8))],
+                              refresh=False)
+    candidates.rebuild()
+    # Bowls that are real recipes, so the candidate set narrows all the way down to a match
+    bowls = [list(candidates.requirements[f"Recipe {rng.randrange(recipes)}"].elements()) for _ in range(50)]
+
+    def run():
+        for bowl in bowls:
+            for iid in bowl:
+                candidates.add(iid)
+            candidates.possible_recipes()
+            candidates.clear()
+    return run, len(bowls)
+
+@benchmark("session.scripted")
+def bench_session(screen, frames=300):
+    """The main loop for `frames` frames at a fixed 60 FPS with scripted clicks, bakes and disasters"""
+    from animation import PopupText, ScreenFlash
+    from background import Background
+    from baking_game import handle_keydown, handle_mouse_click
+    from dirty_rects import tracker
+    from drawing_utils import draw_game, update_bakecoin_display
+
+    def run():
+        random.seed(SEED)
+        np.random.seed(SEED)
+        game, animation_manager = new_game()
+        background = Background()
+        popup_text = screen_flash = None
+        dt = 1 / 60
+        for frame in range(frames):
+            start = time.perf_counter()
+            if frame % 15 == 5:
+                slot = frame // 15 % 10
+                click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1,
+                                           pos=(50 + slot // 5 * 150, 150 + slot % 5 * 120))
+                handle_mouse_click(click, game, animation_manager)
+            elif frame % 120 == 110:
+                handle_keydown(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN), game)
+            elif frame % 200 == 50:
+                game.trigger_kitchen_disaster()
+
+            background.update()
+            background.draw(screen)
+            game.update(dt)
+            if game.discovery_messages and not popup_text:
+                popup_text = PopupText(game.discovery_messages.pop(0), WIDTH // 2, HEIGHT // 2)
+            if game.update_disaster(dt):
+                screen_flash = ScreenFlash()
+            if game.baking:
+                result, _ = game.handle_baking_process()
+                popup_text = PopupText(result, WIDTH // 2, HEIGHT // 2)
+                game.baking = False
+            draw_game(screen, game, animation_manager, dt)
+            update_bakecoin_display(screen, game)
+            if popup_text:
+                popup_text.update()
+                popup_text.draw(screen)
+                if popup_text.is_finished():
+                    popup_text = None
+            if screen_flash:
+                screen_flash.update(dt)
+                screen_flash.draw(screen)
+                if screen_flash.is_finished():
+                    screen_flash = None
+            tracker.present(screen)
+            run.frame_times.append(time.perf_counter() - start)
+    run.frame_times = []
+    return run, frames
+
+def measure(run, operations, min_time, repeats):
+    """Median and best seconds per operation over repeats batches of at least min_time / repeats each"""
+    run()  # Warm caches the way a running game would have them
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeats or calls >= 1 << 20:
+            break
+        calls *= 2
+    batches = [elapsed]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        batches.append(time.perf_counter() - start)
+    per_operation = [batch / (calls * operations) for batch in batches]
+    return statistics.median(per_operation), min(per_operation), calls * repeats
+
+def run_benchmarks(patterns=("*",), min_time=1.0, repeats=5, frame_budget_ms=None):
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+            continue
+        random.seed(SEED)
+        np.random.seed(SEED)
+        # Game and AnimationManager print debug lines as they go
+        with contextlib.redirect_stdout(io.StringIO()):
+            run, operations = setup(screen)
+            median, best, calls = measure(run, operations, min_time, repeats)
+        result = {"median_us": median * 1e6, "min_us": best * 1e6, "calls": calls, "operations": operations}
+        frame_times = getattr(run, "frame_times", None)
+        if frame_times:
+            ms = np.array(frame_times) * 1000
+            result["p95_frame_ms"] = float(np.percentile(ms, 95))
+            result["max_frame_ms"] = float(ms.max())
+            if frame_budget_ms is not None:
+                result["frame_budget_ms"] = frame_budget_ms
+        results[name] = result
+        print(f"{name:<28} {median * 1e6:12.1f} us  (best {best * 1e6:.1f}, {calls} runs)", flush=True)
+    pygame.quit()
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": platform.platform(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "min_time": min_time,
+        "results": results,
+    }
+
+def compare(baseline, current, threshold):
+    """Print how each benchmark moved; returns the names that regressed beyond threshold"""
+    regressions = []
+    print(f"{'benchmark':<28}{'baseline us':>14}{'current us':>14}{'change':>9}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<28}{'-':>14}{result['median_us']:14.1f}      new")
+            continue
+        ratio = result["median_us"] / base["median_us"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 / (1 + threshold):
+            flag = "  faster"
+        print(f"{name:<28}{base['median_us']:14.1f}{result['median_us']:14.1f}{ratio - 1:+9.1%}{flag}")
+    for name in baseline["results"].keys() - current["results"].keys():
+        print(f"{name:<28}{baseline['results'][name]['median_us']:14.1f}{'-':>14}  missing")
+    return regressions
+
+def over_budget(current):
+    """Scripted sessions whose slowest frame went over their frame budget"""
+    return [name for name, result in current["results"].items()
+            if "frame_budget_ms" in result and result["max_frame_ms"] > result["frame_budget_ms"]]
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless benchmarks with JSON baselines")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and write their results")
+    run_parser.add_argument("patterns", nargs="*", default=["*"], help="glob patterns of benchmarks to run")
+    run_parser.add_argument("--out", default="bench.json", help="where to write the results")
+    run_parser.add_argument("--compare", metavar="BASELINE", help="compare the results against this baseline")
+    run_parser.add_argument("--threshold", type=float, default=0.10,
+                            help="slowdown that counts as a regression (0.10 = 10%%)")
+    run_parser.add_argument("--min-time", type=float, default=1.0, help="seconds spent timing each benchmark")
+    run_parser.add_argument("--repeats", type=int, default=5)
+    run_parser.add_argument("--frame-budget-ms", type=float, default=None,
+                            help="fail if any scripted session frame takes longer than this")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+
+    commands.add_parser("list", help="list the benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name in BENCHMARKS:
+            print(name)
+        return 0
+
+    if args.command == "compare":
+        regressions = compare(load(args.baseline), load(args.current), args.threshold)
+        return 1 if regressions else 0
+
+    current = run_benchmarks(args.patterns, args.min_time, args.repeats, args.frame_budget_ms)
+    with open(args.out, "w") as f:
+        json.dump(current, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    failed = False
+    slow = over_budget(current)
+    if slow:
+        print(f"Over the {args.frame_budget_ms} ms frame budget: {', '.join(slow)}")
+        failed = True
+    if args.compare:
+        print()
+        if compare(load(args.compare), current, args.threshold):
+            failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
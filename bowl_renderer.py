@@ -0,0 +1,180 @@
+import pygame
+import math
+import time
+import numpy as np
+from config import WIDTH, HEIGHT
+from dirty_rects import tracker
+
+# Wave parameters
+WAVE_SPEED = 2
+WAVE_HEIGHT = 3
+NUM_WAVES = 3
+MAX_FILL_HEIGHT = 100
+
+# sum_i sin(t + y*0.1 + 2i) == sin(t) * C[y] + cos(t) * S[y], so the per-row
+# phase part of the waves is computed once for every row the liquid can have
+_rows = np.arange(MAX_FILL_HEIGHT + 1)
+_row_phases = _rows[:, None] * 0.1 + np.arange(NUM_WAVES)[None, :] * 2
+WAVE_COS_TABLE = np.cos(_row_phases).sum(axis=1)
+WAVE_SIN_TABLE = np.sin(_row_phases).sum(axis=1)
+
+def _star_offsets(size):
+    """Pixel offsets covered by an 8-ray star sparkle of the given size"""
+    points = set()
+    for angle in range(0, 360, 45):
+        rad = math.radians(angle)
+        for k in range(size + 1):
+            points.add((int(round(math.cos(rad) * k)), int(round(math.sin(rad) * k))))
+    dx, dy = zip(*sorted(points))
+    return np.array(dx), np.array(dy)
+
+STAR_OFFSETS = {size: _star_offsets(size) for size in (1, 2, 3)}
+
+class BowlRenderer:
+    """Draws the mixing bowl, caching everything that only depends on its size and colors.
+
+    The glow and neon outline are rebuilt only when the liquid color, outline
+    color or bowl size change. The liquid itself is filled through NumPy views
+    of a reused surface instead of one draw call per scanline.
+    """
+
+    def __init__(self):
+        self.shell_key = None
+        self.shell_surface = None
+        self.reflection_width = None
+        self.reflection_surface = None
+        self.liquid_surface = None
+
+    def get_shell(self, bowl_size, liquid_color, outline_color):
+        key = (bowl_size, liquid_color, outline_color)
+        if key != self.shell_key:
+            surface = pygame.Surface((bowl_size + 20, 150), pygame.SRCALPHA)
+            # Bowl glow
+            for r in range(10, 0, -1):
+                alpha = int(25 * r)
+                pygame.draw.ellipse(surface, (*liquid_color, alpha),
+                                    (r, r, bowl_size + 20 - 2*r, 50 - r))
+            # Neon outline, offset from the screen position into the glow surface
+            left = (bowl_size + 20)//2 - bowl_size//2
+            for i in range(3):
+                alpha = 255 - i * 50
+                pygame.draw.ellipse(surface, (*outline_color, alpha),
+                                    (left - i, 10 - i, bowl_size + i*2, 50 + i*2), 2)
+            self.shell_key = key
+            self.shell_surface = surface
+        return self.shell_surface
+
+    def get_reflection(self, width):
+        if width != self.reflection_width:
+            reflection_height = 10
+            surface = pygame.Surface((width, reflection_height), pygame.SRCALPHA)
+            pygame.draw.ellipse(surface, (255, 255, 255, 30),
+                                (0, 0, width, reflection_height * 2))
+            self.reflection_width = width
+            self.reflection_surface = surface
+        return self.reflection_surface
+
+    def draw(self, screen, bowl_size, outline_color, liquid_color, fill_level,
+             ingredient_count, transition_color=None):
+        liquid_color = tuple(liquid_color[:3])
+        shell = self.get_shell(bowl_size, liquid_color, tuple(outline_color[:3]))
+        tracker.mark(screen.blit(shell, (WIDTH//2 - (bowl_size + 20)//2, HEIGHT//2 - 35)))
+
+        if fill_level <= 0:
+            return
+
+        width = bowl_size - 4
+        fill_height = int(max(fill_level, 0.1) * MAX_FILL_HEIGHT)
+        liquid = self.render_liquid(width, fill_height, liquid_color,
+                                    ingredient_count, transition_color)
+        position = (WIDTH//2 - bowl_size//2 + 2, HEIGHT//2 + 73 - fill_height)
+        tracker.mark(screen.blit(liquid, position))
+
+        # Add surface reflection
+        tracker.mark(screen.blit(self.get_reflection(width), position))
+
+    def render_liquid(self, width, fill_height, base_color, ingredient_count,
+                      transition_color=None):
+        if self.liquid_surface is None or self.liquid_surface.get_size() != (width, fill_height):
+            self.liquid_surface = pygame.Surface((width, fill_height), pygame.SRCALPHA)
+        surface = self.liquid_surface
+        surface.fill((*base_color, 0))
+
+        current_time = time.time()
+        glow_color = tuple(min(255, c + 50) for c in base_color)  # Brighter version
+
+        # Adjust wave effect based on number of ingredients
+        wave_intensity = min(1.0, ingredient_count * 0.2)
+
+        # Wave offset of every row from the precomputed phase tables
+        t = current_time * WAVE_SPEED
+        rows = np.arange(fill_height)
+        wave_offset = (math.sin(t) * WAVE_COS_TABLE[:fill_height] +
+                       math.cos(t) * WAVE_SIN_TABLE[:fill_height]) * WAVE_HEIGHT * wave_intensity
+        x_offset = wave_offset.astype(int)
+
+        # Each row is covered from its offset to the right edge shifted by the offset,
+        # fading in towards the bottom
+        row_alpha = (255 * (0.5 + 0.5 * rows / fill_height)).astype(np.uint8)
+        cols = np.arange(width)[:, None]
+        covered = (cols >= x_offset[None, :]) & (cols <= width + x_offset[None, :])
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        alpha[:] = covered * row_alpha[None, :]
+        del alpha
+
+        # Add bubbles
+        bubble_count = np.random.binomial(fill_height, 0.02 * wave_intensity)
+        for _ in range(bubble_count):
+            bubble_x = np.random.randint(10, width - 9)
+            bubble_y = np.random.randint(0, fill_height)
+            bubble_size = np.random.randint(2, 5)
+            bubble_alpha = np.random.randint(100, 201)
+            pygame.draw.circle(surface, (*glow_color, bubble_alpha),
+                               (bubble_x, bubble_y), bubble_size)
+
+        # Add dynamic swirl effects
+        swirl_time = current_time * 3
+        swirl_color = (*glow_color, 150)
+        for i in range(3):
+            swirl_x = width//2 + 2 + math.cos(swirl_time + i*2) * 20
+            swirl_y = fill_height//2 + math.sin(swirl_time + i*2) * 10
+            for angle in range(0, 360, 30):
+                rad = math.radians(angle)
+                end_x = swirl_x + math.cos(rad + swirl_time) * 10
+                end_y = swirl_y + math.sin(rad + swirl_time) * 5
+                if 0 <= end_x <= width and 0 <= end_y <= fill_height:
+                    pygame.draw.line(surface, swirl_color,
+                                     (swirl_x, swirl_y), (end_x, end_y), 2)
+
+        # Add magical star sparkles, written straight into the pixel arrays
+        spark_count = int(fill_height / 5)
+        if spark_count:
+            spark_x = np.random.randint(0, width, spark_count)
+            spark_y = np.random.randint(0, fill_height, spark_count)
+            spark_size = np.random.randint(1, 4, spark_count)
+            spark_alpha = np.random.randint(150, 256, spark_count)
+            rgb = pygame.surfarray.pixels3d(surface)
+            alpha = pygame.surfarray.pixels_alpha(surface)
+            for size, (dx, dy) in STAR_OFFSETS.items():
+                chosen = spark_size == size
+                if not chosen.any():
+                    continue
+                xs = (spark_x[chosen, None] + dx[None, :]).ravel()
+                ys = (spark_y[chosen, None] + dy[None, :]).ravel()
+                alphas = np.repeat(spark_alpha[chosen], dx.size)
+                inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < fill_height)
+                rgb[xs[inside], ys[inside]] = 255
+                alpha[xs[inside], ys[inside]] = alphas[inside]
+            del rgb, alpha
+
+        # Add color swirls when mixing
+        if transition_color:
+            swirl_points = []
+            swirl_time = current_time * 2
+            for i in range(5):
+                x = width//2 + 2 + math.cos(swirl_time + i) * (20 - i*3)
+                y = fill_height//2 + math.sin(swirl_time + i) * (10 - i*2)
+                swirl_points.append((x, y))
+            pygame.draw.lines(surface, (*transition_color[:3], 200), False, swirl_points, 3)
+
+        return surface
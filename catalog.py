@@ -0,0 +1,224 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+# Bump when the compiled layout changes so stale caches are ignored
+CATALOG_FORMAT = 2
+
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content")
+BASE_CONTENT = os.path.join(CONTENT_DIR, "base.json")
+PACK_DIR = os.path.join(CONTENT_DIR, "packs")
+CACHE_DIR = os.path.join(CONTENT_DIR, ".cache")
+
+DEFAULT_INGREDIENT_COLOR = (200, 200, 200)
+
+def recipe_key(ingredients):
+    """Canonical multiset key: the same ingredients in any order give the same key"""
+    return tuple(sorted(ingredients))
+
+def content_hash(raw):
+    return hashlib.sha256(f"{CATALOG_FORMAT}:".encode() + raw).hexdigest()
+
+def cache_prefix(path):
+    """Cache file prefix for one content file: its name plus a short hash of where it lives"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    location = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:8]
+    return f"{stem}-{location}"
+
+def prune_cache(prefix, keep):
+    """Delete compiled copies of the same content file superseded by keep, and pre-prefix cache files"""
+    for name in os.listdir(CACHE_DIR):
+        if name == keep or not name.endswith(".pickle"):
+            continue
+        if name.startswith(prefix + "-") or "-" not in name:
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
+
+def compile_content(data):
+    """Turn a content file's JSON into lookup-ready tables"""
+    recipes = {name: list(ingredients) for name, ingredients in data.get("recipes", {}).items()}
+    recipe_index = {}
+    for name, ingredients in recipes.items():
+        recipe_index.setdefault(recipe_key(ingredients), name)
+
+    combinations = {}
+    for combo in data.get("combinations", []):
+        combinations.setdefault(recipe_key(combo["ingredients"]), combo["result"])
+
+    return {
+        "base_ingredients": list(data.get("base_ingredients", [])),
+        "starting_recipes": list(data.get("starting_recipes", [])),
+        "order_recipes": list(data.get("order_recipes", [])),
+        "recipes": recipes,
+        "recipe_index": recipe_index,
+        "combinations": combinations,
+        "upgrades": data.get("upgrades", {}),
+        "colors": {name: tuple(color[:3]) for name, color in data.get("colors", {}).items()},
+    }
+
+def load_compiled(path):
+    """Compiled tables for one content file, reusing the on-disk cache when the content is unchanged"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    prefix = cache_prefix(path)
+    cache_name = f"{prefix}-{content_hash(raw)}.pickle"
+    cache_path = os.path.join(CACHE_DIR, cache_name)
+
+    try:
+        with open(cache_path, "rb") as f:
+            compiled = pickle.load(f)
+        if isinstance(compiled, dict):
+            return compiled
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # Truncated, or pickled against code that has since changed; compile again
+        print(f"Ignoring unreadable content cache {cache_path}: {e}")
+
+    compiled = compile_content(json.loads(raw.decode("utf-8")))
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Per-process temp name: sweep workers may compile the same file at once
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        prune_cache(prefix, cache_name)
+    except OSError as e:
+        print(f"Could not cache compiled content {path}: {e}")
+    return compiled
+
+class IngredientTable:
+    """Small integer IDs for ingredient names.
+
+    IDs are handed out in first-seen order and never change, so names and
+    colors can live in plain lists indexed by ID and hot paths can count and
+    compare ints instead of hashing strings.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+        self.colors = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, name):
+        """ID for name, adding it to the table the first time it is seen"""
+        iid = self.ids.get(name)
+        if iid is None:
+            iid = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.colors.append(DEFAULT_INGREDIENT_COLOR)
+        return iid
+
+    def intern_all(self, names):
+        return [self.intern(name) for name in names]
+
+    def set_color(self, name, color):
+        self.colors[self.intern(name)] = tuple(color[:3])
+
+    def color(self, name):
+        return self.colors[self.intern(name)]
+
+class Catalog:
+    """Game content loaded from data files.
+
+    The base content is compiled (or read from the compile cache) up front.
+    Content packs in content/packs are compiled on a background thread
+    started here, so big packs never slow startup or stall a frame. Games
+    then add the compiled recipes a slice per tick through pack_items.
+    """
+
+    def __init__(self, base_path=BASE_CONTENT, pack_dir=PACK_DIR):
+        base = load_compiled(base_path)
+        self.base_ingredients = base["base_ingredients"]
+        self.starting_recipes = base["starting_recipes"]
+        self.order_recipes = base["order_recipes"]
+        self.recipes = base["recipes"]
+        self.recipe_index = base["recipe_index"]
+        self.combinations = base["combinations"]
+        self.upgrades = base["upgrades"]
+        self.colors = base["colors"]
+        self.pack_paths = sorted(glob.glob(os.path.join(pack_dir, "*.json")))
+        self.packs = []       # Compiled packs, appended by the pack thread in pack_paths order
+        self.packs_read = 0   # Pack paths handled so far, including ones skipped as broken
+        self.pack_thread = None
+
+        # Interned in a fixed order (base ingredients first) so IDs are the same every run
+        self.ingredients = IngredientTable()
+        self.ingredients.intern_all(self.base_ingredients)
+        for ingredients in self.recipes.values():
+            self.ingredients.intern_all(ingredients)
+        for key, result in self.combinations.items():
+            self.ingredients.intern_all(key)
+            self.ingredients.intern(result)
+        for name, color in self.colors.items():
+            self.ingredients.set_color(name, color)
+
+        self.start_loading_packs()
+
+    def start_loading_packs(self):
+        if self.pack_paths and self.pack_thread is None:
+            self.pack_thread = threading.Thread(target=self.load_packs, name="content-packs", daemon=True)
+            self.pack_thread.start()
+
+    def load_packs(self):
+        """Compile every pack not read yet, in order; runs on the pack thread"""
+        while self.packs_read < len(self.pack_paths):
+            path = self.pack_paths[self.packs_read]
+            try:
+                self.packs.append(load_compiled(path))
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Skipping content pack {path}: {e}")
+            self.packs_read += 1
+
+    def packs_loaded(self):
+        return self.packs_read >= len(self.pack_paths)
+
+    def wait_for_packs(self):
+        """Block until every pack is compiled (headless runs want the same content every tick)"""
+        if self.pack_thread is not None:
+            self.pack_thread.join()
+        # A forked worker inherits the progress but not the thread; finish here
+        self.load_packs()
+
+    def known_ingredients(self):
+        """Every ingredient name in the base content and the packs, without interning any"""
+        self.wait_for_packs()
+        names = set(self.ingredients.ids)
+        for pack in self.packs:
+            for ingredients in pack["recipes"].values():
+                names.update(ingredients)
+            for key, result in pack["combinations"].items():
+                names.update(key)
+                names.add(result)
+        return names
+
+    def pack_items(self, pack):
+        """Yield ("combination", key, result) and ("recipe", name, ingredients) from one compiled pack.
+
+        The pack's colors are merged on the calling thread, since interning isn't thread-safe.
+        """
+        self.colors.update(pack["colors"])
+        for name, color in pack["colors"].items():
+            self.ingredients.set_color(name, color)
+        for key, result in pack["combinations"].items():
+            yield "combination", key, result
+        for name, ingredients in pack["recipes"].items():
+            yield "recipe", name, ingredients
+
+_catalog = None
+
+def get_catalog():
+    """The process-wide catalog, loaded on first use"""
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog()
+    return _catalog
@@ -0,0 +1,83 @@
+import hashlib
+from collections import Counter
+
+MASK = (1 << 64) - 1
+
+def ingredient_hash(ingredient):
+    """Stable 64-bit value for one ingredient (the same in every run)"""
+    digest = hashlib.blake2b(ingredient.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+class CombinationEngine:
+    """Finds ingredient combinations of any size as the bowl fills up.
+
+    A multiset's hash is the sum of its ingredients' hashes, so adding or
+    removing one ingredient updates the bowl hash in O(1) and a single dict
+    lookup finds the combination whose ingredients equal the bowl. Inputs can
+    be derived ingredients too, which is how combination chains work.
+    Combinations are registered by name; the bowl is tracked by ingredient ID.
+    """
+
+    def __init__(self, table, combinations=None):
+        self.table = table
+        self.hashes = []          # ingredient ID -> 64-bit hash
+        self.index = {}           # multiset hash -> [(sorted ingredient IDs, result name)]
+        self.bowl = Counter()
+        self.bowl_hash = 0
+        for key, result in (combinations or {}).items():
+            self.add_combination(key, result)
+
+    def hash_of(self, iid):
+        hashes = self.hashes
+        while len(hashes) <= iid:
+            hashes.append(ingredient_hash(self.table.names[len(hashes)]))
+        return hashes[iid]
+
+    def multiset_hash(self, ids):
+        return sum(self.hash_of(iid) for iid in ids) & MASK
+
+    def add_combination(self, key, result):
+        ids = tuple(sorted(self.table.intern_all(key)))
+        entries = self.index.setdefault(self.multiset_hash(ids), [])
+        if all(existing != ids for existing, _ in entries):
+            entries.append((ids, result))
+
+    def lookup(self, ingredients):
+        """Result of combining exactly these ingredient names, or None"""
+        ids = self.table.intern_all(ingredients)
+        return self.find(self.multiset_hash(ids), Counter(ids))
+
+    def find(self, multiset_hash, counts):
+        for key, result in self.index.get(multiset_hash, ()):
+            # Confirm the hit so a hash collision can't produce a wrong result
+            if Counter(key) == counts:
+                return result
+        return None
+
+    def add(self, iid):
+        """Track an ingredient landing in the bowl and return the combination it completes, if any"""
+        self.bowl[iid] += 1
+        self.bowl_hash = (self.bowl_hash + self.hash_of(iid)) & MASK
+        return self.current()
+
+    def remove(self, iid):
+        if self.bowl[iid] <= 0:
+            return
+        self.bowl[iid] -= 1
+        if not self.bowl[iid]:
+            del self.bowl[iid]
+        self.bowl_hash = (self.bowl_hash - self.hash_of(iid)) & MASK
+
+    def clear(self):
+        self.bowl.clear()
+        self.bowl_hash = 0
+
+    def sync(self, ids):
+        self.bowl = Counter(ids)
+        self.bowl_hash = self.multiset_hash(ids)
+
+    def current(self):
+        """Combination made by the whole bowl right now, or None"""
+        if not self.bowl:
+            return None
+        return self.find(self.bowl_hash, self.bowl)
@@ -4,8 +4,19 @@ DIFFICULTY_SETTINGS = {
     "Normal": {"disaster_chance": 0.001, "customer_order_chance": 0.0005, "bakecoin_multiplier": 1.0},
     "Hard": {"disaster_chance": 0.002, "customer_order_chance": 0.00025, "bakecoin_multiplier": 0.75}
 }
+STARTING_BAKECOIN = {"Easy": 150, "Normal": 75, "Hard": 50}
+DISASTER_DURATION = 3  # seconds a kitchen disaster stays active
+# disaster_chance and customer_order_chance are per-frame chances at this frame rate;
+# Game turns them into per-second rates so events happen equally often at any FPS
+CHANCE_REFERENCE_FPS = 60
 
-base_ingredients = ["Flour", "Sugar", "Eggs", "Milk", "Butter", "Cocoa", "Vanilla", "Baking Powder", "Powdered Sugar"]
+# Customer orders
+MAX_OPEN_ORDERS = 3      # New customers walk away while this many orders are open
+ORDER_TIME_LIMIT = 120   # Seconds before an order expires
+ORDER_REWARD = 15        # Bakecoin bonus for filling an order, scaled by bakecoin_multiplier
+
+# Ingredients, recipes, combinations, upgrades and colors live in content/ (see catalog.py)
+PACK_ITEMS_PER_TICK = 200  # Content pack recipes/combinations added per game tick
 
 # Color definitions
 WHITE = (255, 255, 255)
@@ -17,4 +28,12 @@ GREEN = (0, 255, 0)
 YELLOW = (255, 255, 0)
 BLUE = (0, 0, 255)
 
+# Push only changed screen regions instead of flipping the whole display every frame
+DIRTY_RECT_RENDERING = True
+DIRTY_AREA_THRESHOLD = 0.5  # Fraction of changed screen above which a full flip is used
+
+# Frame profiler overlay (toggle in game with F3, export a trace with F4)
+PROFILE_FRAMES = False
+PROFILE_WINDOW = 600  # Frames of history kept per stage
+
 # ... other constants ...
@@ -0,0 +1,64 @@
+import pygame
+from config import DIRTY_RECT_RENDERING, DIRTY_AREA_THRESHOLD
+
+class DirtyRegionTracker:
+    """Pushes only the screen areas that were drawn over this frame or the last.
+
+    The background's static layer is the same every frame, so a pixel can
+    only change on the display where something was drawn on top of it now
+    (new content) or in the previous frame (content that moved away or is
+    gone). Draw paths report what they draw with mark(); rects returned by
+    LayeredDirty.draw, blit and pygame.draw can be passed straight in.
+    Full-screen effects call mark_full(), and then the next frame is pushed
+    in full as well so their last frame is cleared. When the rects cover
+    more than full_update_ratio of the screen a plain flip is used instead.
+    """
+
+    def __init__(self, full_update_ratio=DIRTY_AREA_THRESHOLD, enabled=DIRTY_RECT_RENDERING):
+        self.full_update_ratio = full_update_ratio
+        self.enabled = enabled
+        self.rects = []             # Drawn this frame
+        self.previous = []          # Drawn last frame
+        self.full = True
+        self.previous_full = False
+        self.last_rects = []
+        self.full_flips = 0
+        self.partial_updates = 0
+        self.skipped_frames = 0
+
+    def mark(self, rect):
+        """Report a drawn area; takes the Rect that blit and pygame.draw return"""
+        self.rects.append(rect)
+
+    def mark_all(self, rects):
+        self.rects.extend(rects)
+
+    def mark_full(self):
+        self.full = True
+
+    def present(self, screen):
+        screen_rect = screen.get_rect()
+        full = not self.enabled or self.full or self.previous_full
+        rects = []
+        if not full:
+            # display.update clips to the screen itself; overlaps only make the estimate high
+            rects = self.rects + self.previous
+            area = sum(rect.width * rect.height for rect in rects)
+            full = area > self.full_update_ratio * screen_rect.width * screen_rect.height
+
+        self.previous, self.rects = self.rects, []
+        self.previous_full, self.full = self.full, False
+        if full:
+            self.last_rects = [screen_rect]
+            self.full_flips += 1
+            pygame.display.flip()
+        elif rects:
+            self.last_rects = rects
+            self.partial_updates += 1
+            pygame.display.update(rects)
+        else:
+            self.last_rects = []
+            self.skipped_frames += 1
+
+# Shared by every draw path, like the profiler
+tracker = DirtyRegionTracker()
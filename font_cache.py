@@ -0,0 +1,105 @@
+import pygame
+from collections import OrderedDict
+
+# Shared fonts keyed by (face, size) so draw paths stop building new Font objects
+_fonts = {}
+
+# Rendered text surfaces keyed by (text, size, color, antialias, face), least recently used first
+_text_cache = OrderedDict()
+MAX_CACHED_TEXTS = 512
+
+# Glyph atlases keyed by (size, color, chars, face)
+_atlases = {}
+
+stats = {
+    "font_hits": 0,
+    "font_misses": 0,
+    "text_hits": 0,
+    "text_misses": 0,
+}
+
+def get_font(size, face=None):
+    """Return the shared Font for (face, size), creating it on first use"""
+    key = (face, size)
+    font = _fonts.get(key)
+    if font is None:
+        stats["font_misses"] += 1
+        font = pygame.font.Font(face, size)
+        _fonts[key] = font
+    else:
+        stats["font_hits"] += 1
+    return font
+
+def render_text(text, size, color, antialias=True, face=None):
+    """Return a cached rendering of text.
+
+    The returned surface is shared, so callers must copy it before drawing onto it.
+    """
+    key = (text, size, tuple(color), antialias, face)
+    surface = _text_cache.get(key)
+    if surface is not None:
+        stats["text_hits"] += 1
+        _text_cache.move_to_end(key)
+        return surface
+
+    stats["text_misses"] += 1
+    surface = get_font(size, face).render(text, antialias, color)
+    _text_cache[key] = surface
+    if len(_text_cache) > MAX_CACHED_TEXTS:
+        _text_cache.popitem(last=False)
+    return surface
+
+class GlyphAtlas:
+    """A strip of pre-rendered characters for composing short, often-changing labels.
+
+    Counters like "x12" are put together from atlas glyphs instead of being
+    rendered as new text every time the number changes.
+    """
+
+    def __init__(self, size, color, chars, face=None):
+        font = get_font(size, face)
+        glyphs = [font.render(char, True, color) for char in chars]
+        self.height = max(glyph.get_height() for glyph in glyphs)
+        self.surface = pygame.Surface((sum(glyph.get_width() for glyph in glyphs), self.height),
+                                      pygame.SRCALPHA)
+        self.areas = {}
+        x = 0
+        for char, glyph in zip(chars, glyphs):
+            self.surface.blit(glyph, (x, 0))
+            self.areas[char] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+
+    def width(self, text):
+        return sum(self.areas[char].width for char in text)
+
+    def draw(self, surface, text, center):
+        """Draw text from atlas glyphs centered on center"""
+        x = center[0] - self.width(text) // 2
+        y = center[1] - self.height // 2
+        batch = []
+        for char in text:
+            area = self.areas[char]
+            batch.append((self.surface, (x, y), area))
+            x += area.width
+        surface.blits(batch, doreturn=False)
+
+def get_glyph_atlas(size, color, chars="0123456789x-", face=None):
+    """Return the shared GlyphAtlas for these characters, building it on first use"""
+    key = (size, tuple(color), chars, face)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = GlyphAtlas(size, color, chars, face)
+    return atlas
+
+def cached_text_count():
+    return len(_text_cache)
+
+def reset_stats():
+    for key in stats:
+        stats[key] = 0
+
+def clear_cache():
+    """Drop all fonts and rendered text (needed after pygame.font.quit())"""
+    _fonts.clear()
+    _text_cache.clear()
+    _atlases.clear()
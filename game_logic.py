@@ -1,39 +1,44 @@
 import random
+from catalog import get_catalog, recipe_key
+
+def match_recipe(game):
+    """Name of the recipe matching the bowl exactly, or None"""
+    return game.recipe_index.get(recipe_key(game.current_ingredients))
 
 def handle_baking_process(game):
     # Debug print to see what ingredients are being checked
     print(f"Checking recipe with ingredients: {game.current_ingredients}")
     
-    # Check if the current ingredients match any recipe
-    for recipe, ingredients in game.recipes.items():
-        # Debug print for recipe comparison
-        print(f"Comparing with recipe {recipe}: {ingredients}")
-        
-        # Sort both lists to ensure consistent comparison
-        current_sorted = sorted(game.current_ingredients)
-        recipe_sorted = sorted(ingredients)
-        
-        if current_sorted == recipe_sorted:
-            base_reward = 10
-            if "Quality Ingredients" in game.active_upgrades:
-                base_reward += 5  # Extra reward for quality ingredients
-            result = f"Successfully baked {recipe}!"
-            game.current_ingredients = []  # Clear current ingredients after baking
-            game.has_baked = True
-            print(f"Recipe matched! {recipe}")  # Debug print
-            return result, base_reward
+    # Look the bowl up in the recipe index
+    recipe = match_recipe(game)
+    if recipe:
+        base_reward = 10
+        if "Quality Ingredients" in game.active_upgrades:
+            base_reward += 5  # Extra reward for quality ingredients
+        result = f"Successfully baked {recipe}!"
+        game.clear_bowl_ingredients()  # Clear current ingredients after baking
+        game.has_baked = True
+        print(f"Recipe matched! {recipe}")  # Debug print
+        return result, base_reward
 
     # If no recipe matches, it's a failed attempt
     print("No recipe matched with current ingredients")  # Debug print
     penalty = 5
     result = "Baking failed."
-    game.current_ingredients = []  # Clear current ingredients after baking
+    game.clear_bowl_ingredients()  # Clear current ingredients after baking
     return result, -penalty  # Only return the penalty, don't modify bakecoin here
 
 def generate_customer_order():
-    recipes = ["Cake", "Cookies", "Brownies", "Pancakes", "Muffins"]
-    return f"Customer wants: {random.choice(recipes)}"
+    """Recipe a new customer asks for"""
+    return random.choice(get_catalog().order_recipes)
+
+DISASTER_TYPES = ["Oven malfunction", "Ingredient spill", "Power outage"]
+# Upgrade that halves how often each disaster happens
+DISASTER_UPGRADES = {
+    "Oven malfunction": "Better Oven",
+    "Ingredient spill": "Sturdy Shelves",
+    "Power outage": "Backup Generator",
+}
 
 def trigger_kitchen_disaster():
-    disasters = ["Oven malfunction", "Ingredient spill", "Power outage"]
-    return random.choice(disasters)
+    return random.choice(DISASTER_TYPES)
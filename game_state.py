@@ -1,64 +1,171 @@
-from config import DIFFICULTY_SETTINGS, base_ingredients, WIDTH, HEIGHT
+from config import (DIFFICULTY_SETTINGS, STARTING_BAKECOIN, DISASTER_DURATION, CHANCE_REFERENCE_FPS,
+                    MAX_OPEN_ORDERS, ORDER_TIME_LIMIT, ORDER_REWARD, WIDTH, HEIGHT,
+                    PACK_ITEMS_PER_TICK)
 import random
 import pygame
 import math
-from game_logic import trigger_kitchen_disaster, generate_customer_order
-from animation import flash_screen_red
+from game_logic import generate_customer_order, recipe_key, DISASTER_TYPES, DISASTER_UPGRADES
 from sprites import IngredientSprite
+from recipe_candidates import RecipeCandidates
+from combinations import CombinationEngine
+from catalog import get_catalog
+from inventory import IngredientCounts
+from scheduler import EventScheduler, rate_from_chance
+from orders import OrderBook
+from motion import SpriteMotion
+from shelf import Shelf
 
 class Game:
-    def __init__(self, animation_manager):
+    def __init__(self, animation_manager, headless=False):
+        catalog = get_catalog()
+        # Headless games (see simulation.py) keep the rules but create no sprites
+        self.headless = headless
         self.bakecoin = 0  # Initialize to 0
         self.difficulty = "Normal"
+        # Per-game copy so balancing sweeps can try other values
+        self.difficulty_settings = {name: dict(values) for name, values in DIFFICULTY_SETTINGS.items()}
         self.disaster_count = 0
         self.has_baked = False
+        # Ingredients are interned to small IDs; counts live in arrays indexed by ID
+        self.ingredient_table = catalog.ingredients
         self.current_ingredients = []
-        self.discovered_recipes = set(["Cake", "Cookies", "Brownies", "Pancakes", "Muffins"])
+        self.bowl_counts = IngredientCounts(self.ingredient_table)
+        self.discovered_recipes = set(catalog.starting_recipes)
         # Initialize all ingredients with exactly 5
-        self.ingredient_counts = {ing: 5 for ing in base_ingredients}
+        self.ingredient_counts = IngredientCounts(self.ingredient_table,
+                                                  {ing: 5 for ing in catalog.base_ingredients})
         self.active_upgrades = set()
         self.state = "intro"
         self.achievements = {}  # Add this line
         self.baking = False
         self.kitchen_disaster = None
-        self.customer_order = None
-        self.recipes = {
-            "Cake": ["Flour", "Sugar", "Eggs", "Milk", "Butter"],
-            "Cookies": ["Flour", "Sugar", "Eggs", "Butter"],
-            "Brownies": ["Flour", "Sugar", "Eggs", "Cocoa", "Butter"],
-            "Pancakes": ["Flour", "Eggs", "Milk", "Butter"],
-            "Muffins": ["Flour", "Sugar", "Eggs", "Milk", "Baking Powder"],
-            "Chocolate Cake": ["Flour", "Sugar", "Eggs", "Milk", "Butter", "Cocoa"],
-            "Meringue Cookies": ["Eggs", "Sugar", "Vanilla"],
-            "Condensed Milk Fudge": ["Condensed Milk", "Chocolate Chips"]
-        }
+        self.disaster_timer = 0
+        self.orders = OrderBook()
+        self.orders_placed = 0
+        self.orders_filled = 0
+        self.orders_expired = 0
+        self.bakes = 0
+        self.failed_bakes = 0
+        # Game time in seconds and the queue of upcoming disasters and orders
+        self.clock = 0.0
+        self.events = EventScheduler()
+        self.recipes = {name: list(ingredients) for name, ingredients in catalog.recipes.items()}
+        # Canonical ingredient multiset -> recipe name, kept in sync by add_recipe
+        self.recipe_index = dict(catalog.recipe_index)
+        # Every recipe sharing each key in the order added; the first is the one recipe_index holds
+        self.recipes_by_key = {}
+        for name, ingredients in self.recipes.items():
+            self.recipes_by_key.setdefault(recipe_key(ingredients), []).append(name)
+        # Recipes the bowl can still become, narrowed on every ingredient click
+        self.recipe_candidates = RecipeCandidates({
+            name: self.ingredient_table.intern_all(ingredients) for name, ingredients in self.recipes.items()
+        })
         # ... other game state variables ...
-        self.upgrades = {
-            "Better Oven": {"cost": 50, "effect": "Reduces Oven malfunction chance", "icon": "🔥"},
-            "Sturdy Shelves": {"cost": 75, "effect": "Reduces Ingredient spill chance", "icon": "🥣"},
-            "Backup Generator": {"cost": 100, "effect": "Reduces Power outage chance", "icon": "🔌"},
-            "Quality Ingredients": {"cost": 125, "effect": "Improves baking success rate", "icon": "⭐"}
-        }
+        self.upgrades = {name: dict(info) for name, info in catalog.upgrades.items()}
         self.animation_manager = animation_manager
 
-        # Add the combinations dictionary but don't show ingredients until discovered
-        self.combinations = {
-            ("Cocoa", "Sugar"): "Chocolate Chips",
-            ("Milk", "Sugar"): "Condensed Milk",
-            ("Eggs", "Sugar"): "Meringue",
-            ("Powdered Sugar", "Butter"): "Frosting"
-        }
+        # Add the combinations dictionary (keyed by sorted ingredients) but don't show ingredients until discovered
+        self.combinations = dict(catalog.combinations)
+        # Multiset-hash index over combinations of any size, checked as each ingredient lands
+        self.combination_engine = CombinationEngine(self.ingredient_table, self.combinations)
+        # Discovery messages waiting to be shown by the main loop
+        self.discovery_messages = []
         
         # Start with only base ingredients discovered
-        self.discovered_ingredients = set(base_ingredients)
+        self.discovered_ingredients = set(catalog.base_ingredients)
+
+        # Content packs compile on the catalog's thread; their recipes are added a few hundred per tick
+        self.catalog = catalog
+        self.packs_added = 0  # Compiled packs already queued into pending_pack_content
+        self.pending_pack_content = iter(()) if catalog.pack_paths else None
+        if headless and catalog.pack_paths:
+            # Simulations get every pack on the same tick each run, however fast the thread is
+            catalog.wait_for_packs()
 
-        # Add sprite groups
-        self.all_sprites = pygame.sprite.Group()
-        self.ingredient_sprites = pygame.sprite.Group()
+        # Every sprite lives in shelf.sprites; this group holds the shelf's visible page
+        self.ingredient_sprites = pygame.sprite.LayeredDirty()
+        # Shelf sprite positions and bounce, stepped in one array pass per frame
+        self.sprite_motion = SpriteMotion()
+        self.shelf = Shelf(self.ingredient_sprites, self.sprite_motion)
         self.initialize_sprites()
 
+    def add_recipe(self, name, ingredients, refresh_candidates=True):
+        """Add or replace a recipe, keeping recipe_index and recipe_candidates in sync"""
+        if name in self.recipes:
+            old_key = recipe_key(self.recipes[name])
+            owners = self.recipes_by_key[old_key]
+            owners.remove(name)
+            if owners:
+                # Another recipe with the same ingredients takes the key over
+                self.recipe_index[old_key] = owners[0]
+            else:
+                del self.recipes_by_key[old_key]
+                del self.recipe_index[old_key]
+        self.recipes[name] = list(ingredients)
+        key = recipe_key(ingredients)
+        self.recipes_by_key.setdefault(key, []).append(name)
+        self.recipe_index.setdefault(key, name)
+        self.recipe_candidates.add_recipe(name, self.ingredient_table.intern_all(ingredients),
+                                          refresh_candidates)
+
+    def load_pack_content(self, limit=PACK_ITEMS_PER_TICK):
+        """Add up to limit recipes/combinations from content packs. Returns True while more remain."""
+        if self.pending_pack_content is None:
+            return False
+
+        added = 0
+        while added < limit:
+            item = next(self.pending_pack_content, None)
+            if item is None:
+                # Read the done flag first: the thread appends a pack before counting it as read
+                loaded = self.catalog.packs_loaded()
+                if self.packs_added < len(self.catalog.packs):
+                    self.pending_pack_content = self.catalog.pack_items(self.catalog.packs[self.packs_added])
+                    self.packs_added += 1
+                    continue
+                if loaded:
+                    self.pending_pack_content = None
+                break  # The next pack is still compiling
+
+            kind, key, value = item
+            if kind == "recipe":
+                self.add_recipe(key, value, refresh_candidates=False)
+            elif key not in self.combinations:
+                self.combinations[key] = value
+                self.combination_engine.add_combination(key, value)
+            added += 1
+
+        if added and self.current_ingredients:
+            self.recipe_candidates.rebuild()
+        return self.pending_pack_content is not None
+
+    def add_to_bowl(self, ing, iid=None):
+        if iid is None:
+            iid = self.ingredient_table.intern(ing)
+        self.current_ingredients.append(ing)
+        self.bowl_counts.add_id(iid)
+        self.recipe_candidates.add(iid)
+        self.check_for_combinations(self.combination_engine.add(iid))
+
+    def remove_from_bowl(self, ing):
+        iid = self.ingredient_table.intern(ing)
+        self.current_ingredients.remove(ing)
+        self.bowl_counts.add_id(iid, -1)
+        self.recipe_candidates.remove(iid)
+        self.combination_engine.remove(iid)
+
+    def clear_bowl_ingredients(self):
+        self.current_ingredients.clear()
+        self.bowl_counts.clear()
+        self.recipe_candidates.clear()
+        self.combination_engine.clear()
+
+    def possible_recipes(self):
+        """Recipes still reachable from the bowl, in catalog order"""
+        return self.recipe_candidates.possible_recipes()
+
     def apply_difficulty(self):
-        return DIFFICULTY_SETTINGS[self.difficulty]
+        return self.difficulty_settings[self.difficulty]
 
     def start_baking(self):
         if len(self.current_ingredients) > 0 and not self.baking:
@@ -70,48 +177,128 @@ class Game:
         if self.animation_manager.is_animating:
             return None, None, None
 
-        # Check collision with ingredient sprites
-        pos = pygame.mouse.get_pos()
-        for sprite in self.ingredient_sprites:
-            if sprite.rect.collidepoint(pos):
-                ing = sprite.name
-                if self.ingredient_counts[ing] > 0:
-                    self.current_ingredients.append(ing)
-                    self.ingredient_counts[ing] -= 1
-                    sprite.update_count(self.ingredient_counts[ing])
-                    return ing, sprite.rect.centerx, sprite.rect.centery
+        # Look up the clicked slot on the visible shelf page
+        sprite = self.shelf.sprite_at(x, y)
+        if sprite and self.use_ingredient(sprite.name, sprite):
+            return sprite.name, sprite.rect.centerx, sprite.rect.centery
 
         return None, None, None
 
-    def check_for_combinations(self):
-        # Only check for combinations if there are exactly 2 ingredients
-        if len(self.current_ingredients) == 2:
-            ing1, ing2 = self.current_ingredients[0], self.current_ingredients[1]
-            combination = tuple(sorted([ing1, ing2]))
-            new_ingredient = self.combinations.get(combination)
-            
-            if new_ingredient and new_ingredient not in self.discovered_ingredients:
-                self.discovered_ingredients.add(new_ingredient)
-                self.ingredient_counts[new_ingredient] = 5
-                print(f"New ingredient discovered: {new_ingredient}")  # Debug print
-                return f"New ingredient discovered: {new_ingredient}!"
+    def use_ingredient(self, ing, sprite=None):
+        """Move one of ing from the shelf into the bowl. Returns False when none are left."""
+        iid = sprite.ingredient_id if sprite else self.ingredient_table.intern(ing)
+        if self.ingredient_counts.get_id(iid) <= 0:
+            return False
+        self.add_to_bowl(ing, iid)
+        count = self.ingredient_counts.add_id(iid, -1)
+        if sprite:
+            sprite.update_count(count)
+        return True
+
+    def check_for_combinations(self, new_ingredient=None):
+        """Discover what the bowl makes; add_to_bowl passes the engine's result so nothing is recomputed"""
+        if new_ingredient is None:
+            self.combination_engine.sync(self.ingredient_table.intern_all(self.current_ingredients))
+            new_ingredient = self.combination_engine.current()
+
+        discovered = self.discover_ingredients([new_ingredient] if new_ingredient else [])
+        if discovered:
+            message = f"New ingredient discovered: {discovered[0]}!"
+            self.discovery_messages.append(message)
+            return message
         return None
 
-    def update(self):
+    def discover_ingredients(self, names):
+        """Mark ingredients as discovered and add them to the shelf in one layout pass"""
+        new = [name for name in dict.fromkeys(names) if name not in self.discovered_ingredients]
+        if not new:
+            return []
+        self.discovered_ingredients.update(new)
+        for name in new:
+            self.ingredient_counts.setdefault(name, 5)
+            print(f"New ingredient discovered: {name}")  # Debug print
+        self.initialize_sprites()
+        return new
+
+    def update(self, dt=1 / CHANCE_REFERENCE_FPS):
         # Remove the baking process from here since it's handled in handle_keydown
-        
-        # Check for kitchen disasters
+
+        # Pull in content pack recipes a slice at a time
+        if self.pending_pack_content is not None:
+            self.load_pack_content()
+
+        # Disasters and customer orders come from the timer queue; idle ticks just compare times
+        self.clock += dt
+        for event, _ in self.events.due(self.clock):
+            if event == "disaster":
+                self.trigger_kitchen_disaster()
+            elif event == "order":
+                self.place_order()
+                self.schedule_order()
+
+        # Only orders at the top of the deadline heap are looked at
+        for order in self.orders.expire(self.clock):
+            self.orders_expired += 1
+            print(f"Order expired: {order.recipe}")  # Debug print
+
+        # Move and bounce the shelf sprites
+        self.sprite_motion.step()
+
+    def update_disaster(self, dt):
+        """Apply the active disaster on its first tick and clear it DISASTER_DURATION seconds later.
+
+        Returns True on the tick the disaster cost the player ingredients.
+        """
         if not self.kitchen_disaster:
-            if random.random() < self.apply_difficulty()["disaster_chance"]:
-                self.kitchen_disaster = trigger_kitchen_disaster()
-        
-        # Generate customer orders
-        if not self.customer_order:
-            if random.random() < self.apply_difficulty()["customer_order_chance"]:
-                self.customer_order = generate_customer_order()
+            return False
 
-        # Update all sprites
-        self.all_sprites.update()
+        if self.disaster_timer == 0:
+            self.animation_manager.trigger_disaster_animation(self.kitchen_disaster, self)
+            ingredients_affected = self.handle_disaster_animation(self.animation_manager)
+            if ingredients_affected:
+                self.reset_bowl()
+            self.disaster_timer = DISASTER_DURATION
+            return ingredients_affected
+
+        self.disaster_timer -= dt
+        if self.disaster_timer <= 0:
+            self.disaster_timer = 0
+            self.kitchen_disaster = None
+            self.animation_manager.clear_disaster_animations()
+            self.schedule_disaster()
+        return False
+
+    def disaster_rates(self):
+        """Disasters per second of each type, halved for the types an active upgrade protects against"""
+        chance = self.apply_difficulty()["disaster_chance"]
+        rate = rate_from_chance(chance, CHANCE_REFERENCE_FPS) / len(DISASTER_TYPES)
+        return {
+            disaster: rate * 0.5 if DISASTER_UPGRADES[disaster] in self.active_upgrades else rate
+            for disaster in DISASTER_TYPES
+        }
+
+    def schedule_disaster(self):
+        self.events.schedule_after("disaster", self.clock, sum(self.disaster_rates().values()), random)
+
+    def schedule_order(self):
+        chance = self.apply_difficulty()["customer_order_chance"]
+        self.events.schedule_after("order", self.clock, rate_from_chance(chance, CHANCE_REFERENCE_FPS), random)
+
+    def schedule_random_events(self):
+        self.events.clear()
+        if not self.kitchen_disaster:
+            self.schedule_disaster()
+        self.schedule_order()
+
+    def place_order(self, recipe=None):
+        """Open a customer order unless too many are already waiting"""
+        if len(self.orders) >= MAX_OPEN_ORDERS:
+            return None
+        reward = round(ORDER_REWARD * self.apply_difficulty()["bakecoin_multiplier"])
+        order = self.orders.place(recipe or generate_customer_order(), reward,
+                                  self.clock, ORDER_TIME_LIMIT)
+        self.orders_placed += 1
+        return order
 
     def handle_baking_process(self):
         # Don't process baking if animation is in progress
@@ -121,31 +308,35 @@ class Game:
         if not self.current_ingredients:
             return None, 0
 
-        # Check if the current ingredients match any recipe
-        for recipe, ingredients in self.recipes.items():
-            # Sort both lists to ensure consistent comparison
-            current_sorted = sorted(self.current_ingredients)
-            recipe_sorted = sorted(ingredients)
-            
-            if current_sorted == recipe_sorted:
-                base_reward = 10
-                if "Quality Ingredients" in self.active_upgrades:
-                    base_reward += 5  # Extra reward for quality ingredients
-                result = f"Successfully baked {recipe}!"
-                self.current_ingredients.clear()  # Clear current ingredients after baking
-                self.animation_manager.reset_bowl()  # Reset the bowl visualization
-                self.has_baked = True
-                print(f"Recipe matched! {recipe}")  # Debug print
-                self.bakecoin += base_reward  # Add the reward to bakecoin
-                return result, base_reward
+        # The candidate index already resolved the match while ingredients were added
+        recipe = self.recipe_candidates.match
+        if recipe:
+            base_reward = 10
+            if "Quality Ingredients" in self.active_upgrades:
+                base_reward += 5  # Extra reward for quality ingredients
+            base_reward = round(base_reward * self.apply_difficulty()["bakecoin_multiplier"])
+            result = f"Successfully baked {recipe}!"
+            order = self.orders.fulfil(recipe)
+            if order:
+                self.orders_filled += 1
+                base_reward += order.reward
+                result = f"Order filled: {recipe}! +{order.reward} bonus"
+            self.clear_bowl_ingredients()  # Clear current ingredients after baking
+            self.animation_manager.reset_bowl()  # Reset the bowl visualization
+            self.has_baked = True
+            self.bakes += 1
+            print(f"Recipe matched! {recipe}")  # Debug print
+            self.bakecoin += base_reward  # Add the reward to bakecoin
+            return result, base_reward
 
         # If no recipe matches, it's a failed attempt
         print("No recipe matched with current ingredients")  # Debug print
         penalty = 5
         result = f"Baking failed! Lost {penalty} Bakecoin"  # Added penalty amount to message
-        self.current_ingredients.clear()  # Clear current ingredients after baking
+        self.clear_bowl_ingredients()  # Clear current ingredients after baking
         self.animation_manager.reset_bowl()  # Reset the bowl visualization
         self.bakecoin -= penalty  # Subtract the penalty from bakecoin
+        self.failed_bakes += 1
         return result, -penalty
 
     def load_from_save(self, save_data):
@@ -161,43 +352,40 @@ class Game:
     def choose_difficulty(self, key):
         print(f"Choosing difficulty with key: {pygame.key.name(key)}")  # Debug print
         if key == pygame.K_e:
-            self.difficulty = "Easy"
-            self.bakecoin = 150  # Starting amount for Easy
+            self.start("Easy")
         elif key == pygame.K_n:
-            self.difficulty = "Normal"
-            self.bakecoin = 75   # Starting amount for Normal
+            self.start("Normal")
         elif key == pygame.K_h:
-            self.difficulty = "Hard"
-            self.bakecoin = 50   # Starting amount for Hard
-        self.state = "main_game"
+            self.start("Hard")
+        else:
+            self.state = "main_game"
+            self.schedule_random_events()
         print(f"Difficulty set to: {self.difficulty}, Bakecoin: {self.bakecoin}, State changed to: {self.state}")  # Debug print
 
+    def start(self, difficulty):
+        """Begin the main game at the given difficulty with its starting Bakecoin"""
+        self.difficulty = difficulty
+        self.bakecoin = STARTING_BAKECOIN[difficulty]
+        self.state = "main_game"
+        self.schedule_random_events()
+
     def trigger_kitchen_disaster(self):
-        base_chance = self.apply_difficulty()["disaster_chance"]
-        disaster_types = ["Oven malfunction", "Ingredient spill", "Power outage"]
-        
-        for disaster in disaster_types:
-            if disaster == "Oven malfunction" and "Better Oven" in self.active_upgrades:
-                base_chance *= 0.5
-            elif disaster == "Ingredient spill" and "Sturdy Shelves" in self.active_upgrades:
-                base_chance *= 0.5
-            elif disaster == "Power outage" and "Backup Generator" in self.active_upgrades:
-                base_chance *= 0.5
-            
-            if random.random() < base_chance:
-                self.kitchen_disaster = disaster
-                self.disaster_count += 1
-                self.animation_manager.trigger_disaster_animation(disaster, self)
-                return self.kitchen_disaster
-        
-        return None
+        """Start a disaster, picking its type in proportion to the upgrade-adjusted rates.
+
+        update_disaster applies it and counts it on the next tick.
+        """
+        rates = self.disaster_rates()
+        if not sum(rates.values()):
+            return None
+        self.kitchen_disaster = random.choices(list(rates), weights=list(rates.values()))[0]
+        return self.kitchen_disaster
 
     def handle_disaster_animation(self, animation_manager):
         ingredients_affected = False
         if self.kitchen_disaster == "Ingredient spill":
             if self.current_ingredients:
                 removed_ingredient = random.choice(self.current_ingredients)
-                self.current_ingredients.remove(removed_ingredient)
+                self.remove_from_bowl(removed_ingredient)
                 # Set bowl fill level proportional to remaining ingredients
                 animation_manager.bowl_fill_level = len(self.current_ingredients) * 0.1
                 self.ingredient_counts[removed_ingredient] = max(0, self.ingredient_counts[removed_ingredient] - 1)
@@ -207,7 +395,7 @@ class Game:
             if random.random() < 0.3:  # 30% chance
                 for ing in self.current_ingredients:
                     self.ingredient_counts[ing] = max(0, self.ingredient_counts[ing] - 1)
-                self.current_ingredients.clear()
+                self.clear_bowl_ingredients()
                 # Reset bowl fill level when all ingredients are lost
                 animation_manager.bowl_fill_level = 0
                 ingredients_affected = True
@@ -216,7 +404,8 @@ class Game:
             if self.current_ingredients:
                 remove_count = len(self.current_ingredients) // 2
                 for _ in range(remove_count):
-                    ing = self.current_ingredients.pop(random.randint(0, len(self.current_ingredients) - 1))
+                    ing = random.choice(self.current_ingredients)
+                    self.remove_from_bowl(ing)
                     self.ingredient_counts[ing] = max(0, self.ingredient_counts[ing] - 1)
                 # Set bowl fill level proportional to remaining ingredients
                 animation_manager.bowl_fill_level = len(self.current_ingredients) * 0.1
@@ -225,17 +414,14 @@ class Game:
         self.disaster_count += 1
         return ingredients_affected
 
-    def combine_ingredients(self, ing1, ing2):
-        # Try both orderings of the ingredients
-        combination = tuple(sorted([ing1, ing2]))
-        new_ingredient = self.combinations.get(combination)
-        
+    def combine_ingredients(self, *ingredients):
+        """Combine any number of ingredients outside the bowl; returns the new ingredient or None"""
+        new_ingredient = self.combination_engine.lookup(ingredients)
+
         if new_ingredient:
-            if new_ingredient not in self.ingredient_counts:
-                self.ingredient_counts[new_ingredient] = 5  # Initialize with 5 when discovered
-            else:
+            if new_ingredient in self.ingredient_counts:
                 self.ingredient_counts[new_ingredient] += 1
-            self.discovered_ingredients.add(new_ingredient)
+            self.discover_ingredients([new_ingredient])
             return new_ingredient
         return None
 
@@ -243,9 +429,10 @@ class Game:
         cost = 25  # Cost for replenishing ingredients
         if self.bakecoin >= cost:
             self.bakecoin -= cost
-            # Reset all discovered ingredients to current amount + 5
+            # Every discovered ingredient is on the shelf, so add 5 to the whole count array at once
             for ing in self.discovered_ingredients:
-                self.ingredient_counts[ing] = self.ingredient_counts.get(ing, 0) + 5
+                self.ingredient_counts.setdefault(ing, 0)
+            self.ingredient_counts.add_to_all(5)
             print(f"Ingredients replenished. Cost: {cost} Bakecoin")
             return True
         else:
@@ -253,29 +440,18 @@ class Game:
             return False
 
     def reset_bowl(self):
-        self.current_ingredients.clear()
+        self.clear_bowl_ingredients()
         self.animation_manager.reset_bowl()
 
     def initialize_sprites(self):
-        # Create sprites in two columns on the left side
-        sprite_width = 100  # Width of each sprite
-        sprite_height = 100  # Height of each sprite
-        margin_left = 50  # Left margin from screen edge
-        margin_top = 150  # Top margin to avoid bakecoin display
-        spacing_y = 20  # Vertical spacing between sprites
-        
-        items_per_column = (len(self.ingredient_counts) + 1) // 2  # Distribute items evenly
-        
-        for i, (ing, count) in enumerate(self.ingredient_counts.items()):
-            column = i // items_per_column  # 0 for first column, 1 for second
-            row = i % items_per_column
-            
-            x = margin_left + column * (sprite_width + 50)  # 50px spacing between columns
-            y = margin_top + row * (sprite_height + spacing_y)
-            
-            sprite = IngredientSprite(ing, x, y, count)
-            self.all_sprites.add(sprite)
-            self.ingredient_sprites.add(sprite)
+        if self.headless:
+            return
+        # Give every shelf ingredient a sprite in the next shelf slot; existing
+        # sprites keep their slots, so discoveries only add the new ones
+        for ing, count in self.ingredient_counts.items():
+            if ing not in self.shelf:
+                sprite = IngredientSprite(ing, 0, 0, count)
+                self.shelf.add(sprite)
 
     def purchase_upgrade(self, mouse_pos):
         """Purchase an upgrade if the player has enough bakecoins"""
@@ -291,17 +467,22 @@ class Game:
             upgrade_index = x // upgrade_width
             if upgrade_index < len(self.upgrades):
                 upgrade_name = list(self.upgrades.keys())[upgrade_index]
-                
-                # Don't allow purchasing already active upgrades
-                if upgrade_name in self.active_upgrades:
-                    return False
-                    
-                upgrade_cost = self.upgrades[upgrade_name]["cost"]
-                if self.bakecoin >= upgrade_cost:
-                    self.bakecoin -= upgrade_cost
-                    self.active_upgrades.add(upgrade_name)
-                    print(f"Purchased upgrade: {upgrade_name}")
-                    return True
-                else:
-                    print(f"Not enough Bakecoin for {upgrade_name}")
+                return self.buy_upgrade(upgrade_name)
+        return False
+
+    def buy_upgrade(self, upgrade_name):
+        # Don't allow purchasing already active upgrades
+        if upgrade_name in self.active_upgrades:
+            return False
+
+        upgrade_cost = self.upgrades[upgrade_name]["cost"]
+        if self.bakecoin >= upgrade_cost:
+            self.bakecoin -= upgrade_cost
+            self.active_upgrades.add(upgrade_name)
+            # Resample the next disaster now that its rate may have dropped
+            if self.events.is_scheduled("disaster"):
+                self.schedule_disaster()
+            print(f"Purchased upgrade: {upgrade_name}")
+            return True
+        print(f"Not enough Bakecoin for {upgrade_name}")
         return False
@@ -0,0 +1,205 @@
+import pygame
+import numpy as np
+from collections import Counter
+from config import WIDTH, HEIGHT, GREEN, GRAY, WHITE
+from font_cache import render_text
+from dirty_rects import tracker
+
+def label(text, font_size, bg_color, border_radius, padding=(10, 5)):
+    """Text on a rounded translucent background, as one surface"""
+    text_surface = render_text(text, font_size, WHITE[:3])
+    pad_x, pad_y = padding
+    surface = pygame.Surface((text_surface.get_width() + pad_x * 2, text_surface.get_height() + pad_y * 2),
+                             pygame.SRCALPHA)
+    pygame.draw.rect(surface, bg_color, surface.get_rect(), border_radius=border_radius)
+    surface.blit(text_surface, padding)
+    return surface
+
+def _runs(mask):
+    """(start, end) of every run of True in a 1-D boolean array"""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.view(np.int8), [0]))))
+    return zip(edges[::2], edges[1::2])
+
+def opaque_areas(surface):
+    """Rects covering the non-transparent parts of surface, one per block of rows and columns"""
+    alpha = pygame.surfarray.pixels_alpha(surface)
+    areas = []
+    for top, bottom in _runs(alpha.any(axis=0)):
+        for left, right in _runs(alpha[:, top:bottom].any(axis=1)):
+            areas.append(pygame.Rect(left, top, right - left, bottom - top))
+    del alpha
+    return areas
+
+class Widget:
+    """A HUD element whose surface is re-rendered only when its key changes.
+
+    key(game) returns the Game fields the widget shows (cheap to compute every
+    frame); render(game) returns (surface or None, screen position).
+    """
+
+    def __init__(self, name, key, render):
+        self.name = name
+        self.key = key
+        self.render = render
+        self.current_key = None
+        self.surface = None
+        self.position = (0, 0)
+        self.rebuilds = 0
+
+    def refresh(self, game):
+        """Re-render if the bound fields changed; returns True when the surface changed"""
+        key = self.key(game)
+        if key == self.current_key:
+            return False
+        self.current_key = key
+        self.surface, self.position = self.render(game)
+        self.rebuilds += 1
+        return True
+
+    def rect(self):
+        return self.surface.get_rect(topleft=self.position) if self.surface else None
+
+def bakecoin_key(game):
+    return game.bakecoin
+
+def render_bakecoin(game):
+    surface = label(f"Bakecoin: {game.bakecoin}", 36, (20, 20, 40, 180), 10)
+    return surface, (WIDTH//2 - surface.get_width()//2, 45)
+
+def recipes_key(game):
+    # discovered_recipes only grows, or is replaced wholesale when a save is loaded.
+    # Keys hold the Game's objects, not id()s: a new Game may reuse a freed one's ids.
+    return game.discovered_recipes, len(game.discovered_recipes)
+
+def render_recipes(game):
+    labels = []
+    for i, recipe in enumerate(game.discovered_recipes):
+        surface = label(recipe, 24, (20, 20, 40, 180), 8)
+        center = (WIDTH - 100, 50 + i * 80)
+        labels.append((surface, surface.get_rect(center=center)))
+    if not labels:
+        return None, (0, 0)
+    bounds = labels[0][1].unionall([rect for _, rect in labels[1:]])
+    column = pygame.Surface(bounds.size, pygame.SRCALPHA)
+    for surface, rect in labels:
+        column.blit(surface, (rect.x - bounds.x, rect.y - bounds.y))
+    return column, bounds.topleft
+
+class OrderPanel:
+    """Open customer orders as one surface, one rounded row per order, most urgent first.
+
+    The countdowns are part of the key, so the panel re-renders once per second
+    while orders are open and not at all otherwise.
+    """
+
+    def __init__(self, font_size=30, spacing=6):
+        self.font_size = font_size
+        self.spacing = spacing
+        self.orders_version = None  # (OrderBook, version) the sorted orders came from
+        self.orders = []
+
+    def key(self, game):
+        # The book itself is part of the key: every Game's versions start from 0
+        version = (game.orders, game.orders.version)
+        if version != self.orders_version:
+            self.orders_version = version
+            self.orders = game.orders.by_deadline()
+        return self.orders_version, tuple(int(order.time_left(game.clock)) for order in self.orders)
+
+    def render(self, game):
+        if not self.orders:
+            return None, (0, 0)
+        lines = [
+            render_text(f"Order: {order.recipe}  +{order.reward} BC  {int(order.time_left(game.clock))}s",
+                        self.font_size, WHITE[:3])
+            for order in self.orders
+        ]
+        width = max(line.get_width() for line in lines) + 20
+        row_height = lines[0].get_height() + 10
+        surface = pygame.Surface((width, len(lines) * (row_height + self.spacing) - self.spacing),
+                                 pygame.SRCALPHA)
+        y = 0
+        for line in lines:
+            bg_rect = pygame.Rect((width - line.get_width() - 20) // 2, y, line.get_width() + 20, row_height)
+            pygame.draw.rect(surface, (20, 20, 40, 180), bg_rect, border_radius=10)
+            surface.blit(line, (bg_rect.x + 10, y + 5))
+            y += row_height + self.spacing
+        return surface, (WIDTH//2 - width//2, 85)
+
+def upgrades_key(game):
+    return (tuple(sorted(game.active_upgrades)),
+            tuple((name, info["cost"]) for name, info in game.upgrades.items()))
+
+def render_upgrade_bar(game):
+    bar = pygame.Surface((WIDTH, 50))
+    upgrade_width = WIDTH // len(game.upgrades)
+    for i, (name, info) in enumerate(game.upgrades.items()):
+        # Draw solid rectangle without rounded corners
+        if name in game.active_upgrades:
+            pygame.draw.rect(bar, GREEN[:3], (i * upgrade_width, 0, upgrade_width, 50))
+            text = render_text(f"{info['icon']} {name} (Active)", 20, WHITE[:3])
+        else:
+            pygame.draw.rect(bar, GRAY[:3], (i * upgrade_width, 0, upgrade_width, 50))
+            text = render_text(f"{info['icon']} {name}: {info['cost']} BC", 20, WHITE[:3])
+
+        # Center text in button
+        text_x = i * upgrade_width + (upgrade_width - text.get_width()) // 2
+        bar.blit(text, (text_x, 15))
+    return bar, (0, HEIGHT - 50)
+
+class HUD:
+    """Retained-mode heads-up display.
+
+    Bakecoin, open orders and the recipe list are composed into one cached
+    overlay surface and the upgrade bar is its own opaque surface. Each frame
+    only recomputes the widgets' keys; a widget re-renders when the Game
+    fields it is bound to change and the overlay is recomposed only then, so
+    a steady frame costs two blit calls. The overlay spans most of the top of
+    the screen but is largely empty, so it is blitted with one blits() call
+    over just its non-transparent areas.
+    """
+
+    def __init__(self):
+        self.order_panel = OrderPanel()
+        self.widgets = [
+            Widget("bakecoin", bakecoin_key, render_bakecoin),
+            Widget("orders", self.order_panel.key, self.order_panel.render),
+            Widget("recipes", recipes_key, render_recipes),
+        ]
+        self.upgrade_bar = Widget("upgrades", upgrades_key, render_upgrade_bar)
+        self.overlay = None
+        self.overlay_pieces = []  # (screen position, area of the overlay)
+        self.overlay_rects = []   # The same pieces in screen coordinates, for the dirty-rect tracker
+        self.stats = Counter()
+
+    def draw_upgrade_bar(self, screen, game):
+        if self.upgrade_bar.refresh(game):
+            self.stats["upgrades"] += 1
+        tracker.mark(screen.blit(self.upgrade_bar.surface, self.upgrade_bar.position))
+
+    def draw_overlay(self, screen, game):
+        changed = False
+        for widget in self.widgets:
+            if widget.refresh(game):
+                self.stats[widget.name] += 1
+                changed = True
+        if changed:
+            self.compose()
+        if self.overlay:
+            screen.blits([(self.overlay, dest, area) for dest, area in self.overlay_pieces],
+                         doreturn=False)
+            tracker.mark_all(self.overlay_rects)
+
+    def compose(self):
+        placed = [(widget.surface, widget.rect()) for widget in self.widgets if widget.surface]
+        self.stats["compose"] += 1
+        if not placed:
+            self.overlay = None
+            return
+        bounds = placed[0][1].unionall([rect for _, rect in placed[1:]])
+        overlay = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        for surface, rect in placed:
+            overlay.blit(surface, (rect.x - bounds.x, rect.y - bounds.y))
+        self.overlay = overlay
+        self.overlay_pieces = [(area.move(bounds.topleft).topleft, area) for area in opaque_areas(overlay)]
+        self.overlay_rects = [pygame.Rect(dest, area.size) for dest, area in self.overlay_pieces]
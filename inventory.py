@@ -0,0 +1,106 @@
+import numpy as np
+
+class IngredientCounts:
+    """Ingredient counts stored in an array indexed by interned ingredient ID.
+
+    Ingredients are listed in the order they were first added, which is the
+    shelf order for the inventory and the adding order for the bowl. Code
+    that works with names can still use it like the old {name: count} dict;
+    hot paths use the *_id methods and never hash a string. version goes up
+    on every change so views of the counts know when to redraw.
+    """
+
+    def __init__(self, table, counts=None):
+        self.table = table
+        self.counts = np.zeros(max(16, len(table)), dtype=np.int32)
+        self.listed = np.zeros(self.counts.size, dtype=bool)
+        self.order = []           # listed IDs, first added first
+        self.version = 0
+        for name, count in (counts or {}).items():
+            self[name] = count
+
+    def _ensure(self, iid):
+        old_size = self.counts.size
+        if iid >= old_size:
+            size = max(iid + 1, old_size * 2)
+            counts = np.zeros(size, dtype=np.int32)
+            counts[:old_size] = self.counts
+            listed = np.zeros(size, dtype=bool)
+            listed[:old_size] = self.listed
+            self.counts, self.listed = counts, listed
+
+    def list_id(self, iid):
+        self._ensure(iid)
+        if not self.listed[iid]:
+            self.listed[iid] = True
+            self.order.append(iid)
+
+    def get_id(self, iid):
+        return int(self.counts[iid]) if iid < self.counts.size else 0
+
+    def set_id(self, iid, count):
+        self.list_id(iid)
+        self.counts[iid] = count
+        self.version += 1
+
+    def add_id(self, iid, amount=1):
+        """Add amount (negative to take) and return the new count"""
+        self.list_id(iid)
+        self.counts[iid] += amount
+        self.version += 1
+        return int(self.counts[iid])
+
+    def add_to_all(self, amount):
+        """Add amount to every listed ingredient in one array operation"""
+        if self.order:
+            self.counts[self.order] += amount
+            self.version += 1
+
+    def nonzero(self):
+        """(ID, count) of every listed ingredient with a count, in listed order"""
+        return [(iid, int(self.counts[iid])) for iid in self.order if self.counts[iid]]
+
+    def total(self):
+        return int(self.counts.sum())
+
+    def clear(self):
+        self.counts[:] = 0
+        self.listed[:] = False
+        self.order.clear()
+        self.version += 1
+
+    # Name-keyed dict interface
+    def __getitem__(self, name):
+        iid = self.table.ids.get(name)
+        if iid is None or iid >= self.listed.size or not self.listed[iid]:
+            raise KeyError(name)
+        return int(self.counts[iid])
+
+    def __setitem__(self, name, count):
+        self.set_id(self.table.intern(name), count)
+
+    def __contains__(self, name):
+        iid = self.table.ids.get(name)
+        return iid is not None and iid < self.listed.size and bool(self.listed[iid])
+
+    def __iter__(self):
+        names = self.table.names
+        return (names[iid] for iid in self.order)
+
+    def __len__(self):
+        return len(self.order)
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def setdefault(self, name, default=0):
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        names = self.table.names
+        return [(names[iid], int(self.counts[iid])) for iid in self.order]
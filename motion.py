@@ -0,0 +1,165 @@
+import numpy as np
+from config import WIDTH, HEIGHT
+
+BOUNCE_SPEED = 0.05     # Bounce phase advanced per frame
+BOUNCE_HEIGHT = 1.5     # Pixels either side of the resting position
+MOVE_SPEED = 5          # Pixels per frame towards a move target
+
+class SpriteMotion:
+    """Struct-of-arrays motion for the shelf's ingredient sprites.
+
+    Positions, move targets and bounce phases live in NumPy arrays and step()
+    advances every sprite in one vectorized pass. Positions are kept as floats
+    and the rect gets the rounded result, so the fractional bounce and move
+    steps no longer pile up truncation error in rect.y. Only rects whose
+    rounded position changed are written back. Sprites that are hidden,
+    resting entirely off screen or have nothing to animate sleep: they are
+    left out of the step until one of them is placed, moved or shown again.
+    """
+
+    def __init__(self, capacity=64, bounds=(0, 0, WIDTH, HEIGHT)):
+        self.bounds = bounds
+        self.count = 0
+        self.sprites = []
+
+        self.x = np.zeros(capacity)           # Resting center
+        self.y = np.zeros(capacity)
+        self.target_x = np.zeros(capacity)
+        self.target_y = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.moving = np.zeros(capacity, dtype=bool)
+        self.phase = np.zeros(capacity)
+        self.bounce = np.zeros(capacity)      # Bounce height, 0 for still sprites
+        self.half_w = np.zeros(capacity)
+        self.half_h = np.zeros(capacity)
+        self.hidden = np.zeros(capacity, dtype=bool)
+        self.shown_x = np.zeros(capacity, dtype=np.int64)   # Center last written to the rect
+        self.shown_y = np.zeros(capacity, dtype=np.int64)
+
+        self._awake = None
+        self._any_moving = False
+
+        self._fields = ["x", "y", "target_x", "target_y", "speed", "moving", "phase", "bounce",
+                        "half_w", "half_h", "hidden", "shown_x", "shown_y"]
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        for name in self._fields:
+            old = getattr(self, name)
+            new = np.zeros(old.size * 2, dtype=old.dtype)
+            new[:old.size] = old
+            setattr(self, name, new)
+
+    def add(self, sprite, bounce=BOUNCE_HEIGHT, speed=MOVE_SPEED):
+        """Start animating sprite from where its rect is now"""
+        if self.count == self.x.size:
+            self._grow()
+        i = self.count
+        sprite.motion_index = i
+        self.sprites.append(sprite)
+        self.count += 1
+
+        x, y = sprite.rect.center
+        self.x[i] = self.target_x[i] = self.shown_x[i] = x
+        self.y[i] = self.target_y[i] = self.shown_y[i] = y
+        self.speed[i] = speed
+        self.moving[i] = False
+        self.phase[i] = 0.0
+        self.bounce[i] = bounce
+        self.half_w[i] = sprite.rect.width / 2
+        self.half_h[i] = sprite.rect.height / 2
+        self.hidden[i] = False
+        self._awake = None
+
+    def place(self, sprite, x, y):
+        """Put sprite at (x, y) straight away, cancelling any move"""
+        i = sprite.motion_index
+        self.x[i] = self.target_x[i] = self.shown_x[i] = x
+        self.y[i] = self.target_y[i] = y
+        self.moving[i] = False
+        self.shown_y[i] = round(y + np.sin(self.phase[i]) * self.bounce[i])
+        sprite.rect.center = (x, int(self.shown_y[i]))
+        self._awake = None
+
+    def move_to(self, sprite, x, y):
+        """Glide sprite to (x, y) at its speed; it bounces again once it arrives"""
+        i = sprite.motion_index
+        self.target_x[i] = x
+        self.target_y[i] = y
+        self.moving[i] = True
+        self._awake = None
+
+    def set_hidden(self, sprites, hidden=True):
+        """Put sprites to sleep (or wake them), e.g. when they leave the visible shelf"""
+        indices = [sprite.motion_index for sprite in sprites]
+        self.hidden[indices] = hidden
+        self._awake = None
+
+    def awake(self):
+        """Indices of the sprites that step: shown, at least partly on screen and animating.
+
+        Cached until a sprite is added, placed, moved, hidden or arrives.
+        """
+        if self._awake is None:
+            n = self.count
+            left, top, right, bottom = self.bounds
+            x, y = self.x[:n], self.y[:n]
+            half_w, half_h = self.half_w[:n], self.half_h[:n]
+            on_screen = ((x + half_w > left) & (x - half_w < right) &
+                         (y + half_h > top) & (y - half_h < bottom))
+            awake = ~self.hidden[:n] & (self.moving[:n] | ((self.bounce[:n] != 0) & on_screen))
+            self._awake = np.flatnonzero(awake)
+            self._any_moving = bool(self.moving[:n].any())
+        return self._awake
+
+    def step(self):
+        """Advance every awake sprite one frame and write back the rects that moved.
+
+        Returns the number of rects written.
+        """
+        awake = self.awake()
+        if awake.size == 0:
+            return 0
+
+        if self._any_moving:
+            self._step_moves()
+
+        # Gentle bounce when not moving
+        still = awake[~self.moving[awake]]
+        self.phase[still] += BOUNCE_SPEED
+
+        new_x = np.rint(self.x[awake]).astype(np.int64)
+        new_y = np.rint(self.y[awake] + np.sin(self.phase[awake]) * self.bounce[awake]).astype(np.int64)
+        changed = (new_x != self.shown_x[awake]) | (new_y != self.shown_y[awake])
+        if not changed.any():
+            return 0
+        indices = awake[changed]
+        new_x, new_y = new_x[changed], new_y[changed]
+        self.shown_x[indices] = new_x
+        self.shown_y[indices] = new_y
+        sprites = self.sprites
+        for i, cx, cy in zip(indices.tolist(), new_x.tolist(), new_y.tolist()):
+            sprites[i].rect.center = (cx, cy)
+        return indices.size
+
+    def _step_moves(self):
+        moving = np.flatnonzero(self.moving[:self.count])
+        dx = self.target_x[moving] - self.x[moving]
+        dy = self.target_y[moving] - self.y[moving]
+        distance = np.hypot(dx, dy)
+        speed = self.speed[moving]
+        gliding = distance > speed
+        scale = np.divide(speed, distance, out=np.ones_like(distance), where=gliding)
+        # Arrived sprites get scale 1, which lands them exactly on the target
+        self.x[moving] += dx * scale
+        self.y[moving] += dy * scale
+        if not gliding.all():
+            self.moving[moving[~gliding]] = False
+            self._awake = None   # They may have stopped off screen
+
+    def clear(self):
+        self.count = 0
+        self.sprites.clear()
+        self._awake = None
@@ -0,0 +1,88 @@
+import heapq
+import itertools
+
+class Order:
+    __slots__ = ("id", "recipe", "reward", "placed_at", "deadline", "open")
+
+    def __init__(self, order_id, recipe, reward, placed_at, deadline):
+        self.id = order_id
+        self.recipe = recipe
+        self.reward = reward
+        self.placed_at = placed_at
+        self.deadline = deadline
+        self.open = True
+
+    def time_left(self, now):
+        return max(0.0, self.deadline - now)
+
+    def __lt__(self, other):
+        return (self.deadline, self.id) < (other.deadline, other.id)
+
+class OrderBook:
+    """Open customer orders, several at a time, each with a reward and a deadline.
+
+    Orders sit in a min-heap by deadline so a tick only looks at the ones that
+    are due, and a recipe -> orders index lets a bake find the order it fills
+    without scanning. Filled orders stay in the heap and are skipped when they
+    reach the top. version changes whenever the set of open orders does.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.by_recipe = {}   # recipe -> {order id: Order}
+        self.open_orders = {}
+        self.ids = itertools.count(1)
+        self.version = 0
+
+    def __len__(self):
+        return len(self.open_orders)
+
+    def __bool__(self):
+        return bool(self.open_orders)
+
+    def place(self, recipe, reward, now, time_limit):
+        order = Order(next(self.ids), recipe, reward, now, now + time_limit)
+        heapq.heappush(self.heap, order)
+        self.by_recipe.setdefault(recipe, {})[order.id] = order
+        self.open_orders[order.id] = order
+        self.version += 1
+        return order
+
+    def close(self, order):
+        order.open = False
+        del self.open_orders[order.id]
+        waiting = self.by_recipe[order.recipe]
+        del waiting[order.id]
+        if not waiting:
+            del self.by_recipe[order.recipe]
+        self.version += 1
+
+    def fulfil(self, recipe):
+        """Close and return the most urgent open order for recipe, or None"""
+        waiting = self.by_recipe.get(recipe)
+        if not waiting:
+            return None
+        order = min(waiting.values())
+        self.close(order)
+        return order
+
+    def expire(self, now):
+        """Close and return the orders whose deadline has passed"""
+        expired = []
+        heap = self.heap
+        while heap and heap[0].deadline <= now:
+            order = heapq.heappop(heap)
+            if order.open:
+                self.close(order)
+                expired.append(order)
+        return expired
+
+    def by_deadline(self):
+        """Open orders, most urgent first"""
+        return sorted(self.open_orders.values())
+
+    def clear(self):
+        self.heap.clear()
+        self.by_recipe.clear()
+        self.open_orders.clear()
+        self.version += 1
@@ -0,0 +1,141 @@
+import numpy as np
+from config import HEIGHT
+
+# Particle kinds, stored per slot so one pass can step every effect
+FLAME = 0
+SPILL = 1
+FLOUR = 2
+SUGAR = 3
+DROPLET = 4
+
+class ParticleSystem:
+    """Struct-of-arrays particle pool.
+
+    Every particle field lives in a preallocated NumPy array and the first
+    `count` slots are alive. Dead particles are removed by moving live ones
+    from the tail into their slots (swap-and-pop), so the live range stays packed.
+    """
+
+    def __init__(self, capacity=4096, floor=HEIGHT):
+        self.capacity = capacity
+        self.floor = floor
+        self.count = 0
+
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.dx = np.zeros(capacity)
+        self.dy = np.zeros(capacity)
+        self.gravity = np.zeros(capacity)
+        self.life = np.zeros(capacity)        # Frames left, inf for particles culled by position
+        self.size = np.zeros(capacity)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.alpha = np.zeros(capacity)
+        self.fade = np.zeros(capacity)        # Alpha lost per frame
+        self.phase = np.zeros(capacity)       # Flame wobble / sugar sparkle time
+        self.phase_speed = np.zeros(capacity)
+        self.rotation = np.zeros(capacity)
+        self.spin = np.zeros(capacity)
+        self.squish = np.ones(capacity)
+
+        self._fields = [self.kind, self.x, self.y, self.dx, self.dy, self.gravity,
+                        self.life, self.size, self.color, self.alpha, self.fade,
+                        self.phase, self.phase_speed, self.rotation, self.spin, self.squish]
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, kind, n, x, y, dx=0.0, dy=0.0, gravity=0.0, life=np.inf, size=1.0,
+             color=(255, 255, 255), alpha=255.0, fade=0.0, phase=0.0, phase_speed=0.0,
+             rotation=0.0, spin=0.0, squish=1.0):
+        """Add n particles of one kind. Every field may be a scalar or an array of length n.
+
+        Particles beyond the pool capacity are dropped. Returns the number emitted.
+        """
+        n = min(n, self.capacity - self.count)
+        if n <= 0:
+            return 0
+
+        start, end = self.count, self.count + n
+        values = {
+            "x": x, "y": y, "dx": dx, "dy": dy, "gravity": gravity, "life": life,
+            "size": size, "alpha": alpha, "fade": fade, "phase": phase,
+            "phase_speed": phase_speed, "rotation": rotation, "spin": spin, "squish": squish,
+        }
+        self.kind[start:end] = kind
+        for name, value in values.items():
+            value = np.asarray(value, dtype=float)
+            getattr(self, name)[start:end] = value[:n] if value.ndim else value
+        color = np.asarray(color, dtype=np.uint8)
+        self.color[start:end] = color[:n] if color.ndim == 2 else color[:3]
+
+        self.count = end
+        return n
+
+    def step(self):
+        """Advance and cull every live particle in one vectorized pass"""
+        n = self.count
+        if n == 0:
+            return
+
+        kind = self.kind[:n]
+        x, y = self.x[:n], self.y[:n]
+        dy = self.dy[:n]
+
+        x += self.dx[:n]
+        dy += self.gravity[:n]
+        y += dy
+        self.rotation[:n] += self.spin[:n]
+        self.phase[:n] += self.phase_speed[:n]
+        self.life[:n] -= 1
+
+        # Flour fades in whole alpha steps like the original dict-based effect
+        alpha = self.alpha[:n]
+        np.floor(alpha - self.fade[:n], out=alpha)
+
+        # Spilled blobs bounce and squish on the floor
+        spill = kind == SPILL
+        if spill.any():
+            squish = self.squish[:n]
+            hit = spill & (y + self.size[:n] > self.floor)
+            dy[hit] *= -0.6
+            self.dx[:n][hit] *= 0.8
+            self.spin[:n][hit] *= 0.8
+            squish[hit] = 0.5
+            airborne = spill & ~hit
+            # Recover towards round, never stretching past the original shape
+            squish[airborne] = np.clip(squish[airborne] + 0.05, 0.8, 1.0)
+
+        dead = (self.life[:n] <= 0) | (alpha <= 0)
+        dead |= (kind == FLAME) & (y < -100)
+        dead |= spill & (y > self.floor + 100)
+        self._remove(dead)
+
+    def _remove(self, dead):
+        dead_slots = np.flatnonzero(dead)
+        if dead_slots.size == 0:
+            return
+        n = self.count
+        new_count = n - dead_slots.size
+        # Holes inside the surviving range are refilled from live particles in the tail
+        holes = dead_slots[dead_slots < new_count]
+        movers = new_count + np.flatnonzero(~dead[new_count:n])
+        if holes.size:
+            for field in self._fields:
+                field[holes] = field[movers]
+        self.count = new_count
+
+    def kill(self, kinds):
+        """Remove every particle whose kind is in kinds"""
+        if self.count:
+            self._remove(np.isin(self.kind[:self.count], kinds))
+
+    def clear(self):
+        self.count = 0
+
+    def indices(self, kind):
+        """Slots of the live particles of one kind"""
+        return np.flatnonzero(self.kind[:self.count] == kind)
+
+    def has(self, *kinds):
+        return bool(self.count) and bool(np.isin(self.kind[:self.count], kinds).any())
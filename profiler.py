@@ -0,0 +1,210 @@
+import contextlib
+import csv
+import json
+import os
+import time
+from collections import deque
+import numpy as np
+import pygame
+from config import PROFILE_FRAMES, PROFILE_WINDOW
+from font_cache import get_font
+from dirty_rects import tracker
+
+# Histogram bin edges in milliseconds, finer where most stages land
+HISTOGRAM_EDGES_MS = np.array([0, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16.7, 33.3, np.inf])
+
+class StageTimes:
+    """Rolling window of one stage's durations, in milliseconds"""
+
+    def __init__(self, window):
+        self.samples = np.zeros(window)
+        self.filled = 0
+        self.position = 0
+        self.total_calls = 0
+
+    def add(self, ms):
+        self.samples[self.position] = ms
+        self.position = (self.position + 1) % self.samples.size
+        self.filled = min(self.filled + 1, self.samples.size)
+        self.total_calls += 1
+
+    def window(self):
+        return self.samples[:self.filled]
+
+    def histogram(self, edges=HISTOGRAM_EDGES_MS):
+        return np.histogram(self.window(), edges)[0]
+
+    def summary(self):
+        """(mean, p50, p95, max) over the window"""
+        samples = self.window()
+        if not samples.size:
+            return 0.0, 0.0, 0.0, 0.0
+        p50, p95 = np.percentile(samples, (50, 95))
+        return float(samples.mean()), float(p50), float(p95), float(samples.max())
+
+class FrameProfiler:
+    """Times the stages of each frame and keeps live counts next to them.
+
+    Wrap a stage in `with profiler.section(name):`. Sections may nest; name
+    nested ones "parent.child" so they group in the overlay. While disabled,
+    section() hands back one shared null context, so the instrumented loop
+    costs a method call per stage and nothing is recorded.
+
+    Each stage keeps a rolling window of its last `window` durations for the
+    overlay's percentiles and histograms. While enabled, every section and
+    counter sample is also kept in a bounded trace buffer for
+    export_chrome_trace() (chrome://tracing or Perfetto) and export_csv().
+    """
+
+    def __init__(self, enabled=PROFILE_FRAMES, window=PROFILE_WINDOW, trace_limit=200000):
+        self.enabled = enabled
+        self.show_overlay = enabled
+        self.window = window
+        self.stages = {}
+        self.counters = {}
+        self.trace = deque(maxlen=trace_limit)  # (kind, name, frame, start, duration or value)
+        self.frame = 0
+        self.frame_start = None
+        self.origin = time.perf_counter()
+        self._null = contextlib.nullcontext()
+        self.overlay = None
+        self.overlay_due = 0.0
+
+    def toggle(self):
+        """Show or hide the overlay; profiling runs while it is shown"""
+        self.enabled = self.show_overlay = not self.show_overlay
+        self.frame_start = None
+
+    def section(self, name):
+        if not self.enabled:
+            return self._null
+        return _Section(self, name)
+
+    def record(self, name, start, end):
+        ms = (end - start) * 1000
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = StageTimes(self.window)
+        stage.add(ms)
+        self.trace.append(("X", name, self.frame, start - self.origin, end - start))
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self, **counts):
+        """Close the frame, recording its total time and the live counts passed in"""
+        if not self.enabled or self.frame_start is None:
+            return
+        end = time.perf_counter()
+        self.record("frame", self.frame_start, end)
+        for name, value in counts.items():
+            self.counters[name] = value
+            self.trace.append(("C", name, self.frame, end - self.origin, value))
+        self.frame += 1
+
+    def draw_overlay(self, screen):
+        if not self.show_overlay:
+            return
+        # The text changes every frame, so it is only re-rendered twice a second
+        now = time.perf_counter()
+        if self.overlay is None or now >= self.overlay_due:
+            self.overlay = self.render_overlay()
+            self.overlay_due = now + 0.5
+        tracker.mark(screen.blit(self.overlay, (10, 10)))
+
+    def render_overlay(self):
+        # Rendered with the font directly: the numbers change every time and would churn the text cache
+        font = get_font(18)
+        white = (255, 255, 255)
+        frame = self.stages.get("frame")
+        mean = frame.summary()[0] if frame else 0.0
+        title = font.render(f"frame {mean:.2f} ms ({1000 / mean if mean else 0:.0f} fps)   F3 hide  F4 export",
+                            True, white)
+        names = sorted(name for name in self.stages if name != "frame")
+        rows = [("stage", "p50", "p95", "max")]
+        for name in names:
+            _, p50, p95, worst = self.stages[name].summary()
+            rows.append((name, f"{p50:.2f}", f"{p95:.2f}", f"{worst:.2f}"))
+        cells = [[font.render(cell, True, white) for cell in row] for row in rows]
+        counters = "  ".join(f"{name} {value}" for name, value in self.counters.items())
+        footer = font.render(counters, True, white) if counters else None
+
+        line_height = title.get_height()
+        name_width = max(row[0].get_width() for row in cells) + 10
+        column_width = 52
+        bars_x = name_width + 3 * column_width + 10
+        bins = len(HISTOGRAM_EDGES_MS) - 1
+        lines = len(cells) + (2 if footer else 1)
+        width = max(bars_x + bins * 5, title.get_width(), footer.get_width() if footer else 0) + 10
+        surface = pygame.Surface((width, lines * line_height + 10), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 190))
+
+        surface.blit(title, (5, 5))
+        for i, row in enumerate(cells, 1):
+            y = 5 + i * line_height
+            surface.blit(row[0], (5, y))
+            for column, cell in enumerate(row[1:], 1):
+                # Right-align the numbers in their columns
+                surface.blit(cell, (name_width + column * column_width - cell.get_width(), y))
+        if footer:
+            surface.blit(footer, (5, 5 + (len(cells) + 1) * line_height))
+
+        # A small histogram of each stage's window at the end of its row
+        for i, name in enumerate(names, 2):
+            counts = self.stages[name].histogram()
+            peak = counts.max()
+            bottom = 5 + (i + 1) * line_height - 2
+            for b, count in enumerate(counts):
+                if count:
+                    height = max(1, round(count / peak * (line_height - 4)))
+                    pygame.draw.rect(surface, (120, 220, 120), (bars_x + b * 5, bottom - height, 4, height))
+        return surface
+
+    def export_chrome_trace(self, path):
+        """Write the trace buffer in Chrome's trace event format"""
+        pid = os.getpid()
+        events = []
+        for kind, name, frame, start, value in self.trace:
+            event = {"name": name, "ph": kind, "ts": start * 1e6, "pid": pid, "tid": 0}
+            if kind == "X":
+                event["dur"] = value * 1e6
+                event["args"] = {"frame": frame}
+            else:
+                event["args"] = {name: value}
+            events.append(event)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export_csv(self, path):
+        """Write one row per recorded section: frame, stage, start and duration in ms"""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "stage", "start_ms", "duration_ms"])
+            for kind, name, frame, start, value in self.trace:
+                if kind == "X":
+                    writer.writerow([frame, name, f"{start * 1000:.3f}", f"{value * 1000:.3f}"])
+
+    def export(self, basename="frame_profile"):
+        """Write basename.json (Chrome trace) and basename.csv; returns the two paths"""
+        paths = f"{basename}.json", f"{basename}.csv"
+        self.export_chrome_trace(paths[0])
+        self.export_csv(paths[1])
+        return paths
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+profiler = FrameProfiler()
@@ -0,0 +1,99 @@
+from collections import Counter
+
+class RecipeCandidates:
+    """Recipes the current bowl can still turn into, narrowed as ingredients land.
+
+    An inverted index maps each ingredient to how many of it every recipe needs.
+    Adding an ingredient only re-checks the recipes that were still candidates,
+    and once the bowl holds exactly a candidate's ingredients it becomes `match`.
+    Ingredients can be any hashable; Game uses interned ingredient IDs.
+    """
+
+    def __init__(self, recipes=None):
+        self.requirements = {}    # recipe -> Counter of ingredients
+        self.sizes = {}           # recipe -> total number of ingredients
+        self.order = {}           # recipe -> catalog position, earlier recipes win ties
+        self.by_ingredient = {}   # ingredient -> {recipe: count needed}
+        self.next_order = 0
+
+        self.bowl = Counter()
+        self.bowl_size = 0
+        self.candidates = None    # None while the bowl is empty: every recipe is possible
+        self.match = None
+
+        for name, ingredients in (recipes or {}).items():
+            self.add_recipe(name, ingredients)
+
+    def add_recipe(self, name, ingredients, refresh=True):
+        """Register a recipe; pass refresh=False when adding many and call rebuild() after"""
+        if name in self.requirements:
+            self.remove_recipe(name, refresh=False)
+        need = Counter(ingredients)
+        self.requirements[name] = need
+        self.sizes[name] = sum(need.values())
+        self.order[name] = self.next_order
+        self.next_order += 1
+        for ing, count in need.items():
+            self.by_ingredient.setdefault(ing, {})[name] = count
+        if refresh and self.bowl_size:
+            self.rebuild()
+
+    def remove_recipe(self, name, refresh=True):
+        need = self.requirements.pop(name, None)
+        if need is None:
+            return
+        del self.sizes[name]
+        del self.order[name]
+        for ing in need:
+            self.by_ingredient[ing].pop(name, None)
+        if refresh and self.bowl_size:
+            self.rebuild()
+
+    def add(self, ingredient):
+        """Narrow the candidates after ingredient was added to the bowl"""
+        self.bowl[ingredient] += 1
+        self.bowl_size += 1
+        have = self.bowl[ingredient]
+        needed = self.by_ingredient.get(ingredient, {})
+        if self.candidates is None:
+            self.candidates = {r for r, count in needed.items() if count >= have}
+        else:
+            self.candidates = {r for r in self.candidates if needed.get(r, 0) >= have}
+        self.resolve()
+
+    def remove(self, ingredient):
+        if self.bowl[ingredient] <= 0:
+            return
+        self.bowl[ingredient] -= 1
+        if not self.bowl[ingredient]:
+            del self.bowl[ingredient]
+        self.bowl_size -= 1
+        self.rebuild()
+
+    def clear(self):
+        self.bowl.clear()
+        self.bowl_size = 0
+        self.candidates = None
+        self.match = None
+
+    def rebuild(self):
+        """Recompute candidates from scratch, starting from the bowl's rarest ingredient"""
+        if not self.bowl_size:
+            self.clear()
+            return
+        rarest = min(self.bowl, key=lambda ing: len(self.by_ingredient.get(ing, ())))
+        self.candidates = {
+            r for r in self.by_ingredient.get(rarest, {})
+            if all(self.requirements[r][ing] >= count for ing, count in self.bowl.items())
+        }
+        self.resolve()
+
+    def resolve(self):
+        exact = [r for r in self.candidates if self.sizes[r] == self.bowl_size]
+        self.match = min(exact, key=self.order.get) if exact else None
+
+    def possible_recipes(self):
+        """Candidate recipe names in catalog order"""
+        if self.candidates is None:
+            return sorted(self.requirements, key=self.order.get)
+        return sorted(self.candidates, key=self.order.get)
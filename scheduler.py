@@ -0,0 +1,66 @@
+import heapq
+import itertools
+import math
+
+def rate_from_chance(chance, fps):
+    """Events per second matching a per-frame chance rolled at the given frame rate.
+
+    A chance of 1 or more (every frame) is capped at one event per frame on
+    average, so the rate stays finite and waits stay above zero.
+    """
+    if chance <= 0:
+        return 0.0
+    if chance >= 1:
+        return float(fps)
+    return -math.log1p(-chance) * fps
+
+class EventScheduler:
+    """Timer queue of named events, kept as a heap of due times.
+
+    Each name has at most one pending event; scheduling it again replaces the
+    old one, which is dropped lazily when it reaches the top of the heap. An
+    idle tick only compares the clock with the earliest due time.
+    """
+
+    def __init__(self):
+        self.heap = []          # (due time, sequence, name, payload)
+        self.pending = {}       # name -> sequence of its live event
+        self.sequence = itertools.count()
+
+    def schedule(self, name, due, payload=None):
+        seq = next(self.sequence)
+        self.pending[name] = seq
+        heapq.heappush(self.heap, (due, seq, name, payload))
+
+    def schedule_after(self, name, now, rate, rng, payload=None):
+        """Schedule name at now plus an exponential wait with the given rate; a zero rate cancels it"""
+        if rate <= 0:
+            self.cancel(name)
+            return
+        self.schedule(name, now + rng.expovariate(rate), payload)
+
+    def cancel(self, name):
+        self.pending.pop(name, None)
+
+    def is_scheduled(self, name):
+        return name in self.pending
+
+    def due(self, now):
+        """Pop and yield (name, payload) for every live event due by now, earliest first.
+
+        The due events are taken off the heap before the first one is yielded,
+        so an event scheduled while handling them waits for the next call even
+        if it is already due.
+        """
+        heap = self.heap
+        ready = []
+        while heap and heap[0][0] <= now:
+            _, seq, name, payload = heapq.heappop(heap)
+            if self.pending.get(name) == seq:
+                del self.pending[name]
+                ready.append((name, payload))
+        yield from ready
+
+    def clear(self):
+        self.heap.clear()
+        self.pending.clear()
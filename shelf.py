@@ -0,0 +1,151 @@
+import pygame
+
+class SpatialHash:
+    """Uniform grid of cells mapping screen points to the items whose rects cover them.
+
+    A point query looks at one cell, so hit-testing costs the same however
+    many items are indexed. Items can be inserted and removed one at a time.
+    """
+
+    def __init__(self, cell_width, cell_height, origin=(0, 0)):
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.origin = origin
+        self.cells = {}        # (column, row) -> [item]
+        self.item_cells = {}   # item -> [(column, row)]
+
+    def cell(self, x, y):
+        return (int((x - self.origin[0]) // self.cell_width),
+                int((y - self.origin[1]) // self.cell_height))
+
+    def insert(self, item, rect):
+        left, top = self.cell(rect.left, rect.top)
+        right, bottom = self.cell(rect.right - 1, rect.bottom - 1)
+        covered = [(column, row) for column in range(left, right + 1) for row in range(top, bottom + 1)]
+        for key in covered:
+            self.cells.setdefault(key, []).append(item)
+        self.item_cells[item] = covered
+
+    def remove(self, item):
+        for key in self.item_cells.pop(item, ()):
+            items = self.cells[key]
+            items.remove(item)
+            if not items:
+                del self.cells[key]
+
+    def query(self, x, y):
+        """Items whose cells contain (x, y); callers still check the exact rect"""
+        return self.cells.get(self.cell(x, y), ())
+
+    def clear(self):
+        self.cells.clear()
+        self.item_cells.clear()
+
+class Shelf:
+    """The ingredient shelf: fixed slots in columns on the left, one page at a time.
+
+    Ingredients fill the slots column by column in the order they were added
+    to the inventory, and pages of columns * rows slots hold the rest. Only
+    the current page's sprites are in the visible group (so only they are
+    drawn and get count updates) and in the click index; sprites on other
+    pages are put to sleep in the motion system. version changes whenever
+    the visible page does.
+    """
+
+    def __init__(self, group, motion, columns=2, rows=5, origin=(50, 150), pitch=(150, 120)):
+        self.group = group      # Sprites on the current page
+        self.motion = motion
+        self.columns = columns
+        self.rows = rows
+        self.origin = origin    # Center of the first slot
+        self.pitch = pitch      # Distance between slot centers
+        self.sprites = []       # Every shelf sprite, in shelf order
+        self.by_name = {}
+        self.page = 0
+        self.version = 0
+        # One grid cell per slot, each a full pitch around the slot center so it covers the bounce
+        self.grid = SpatialHash(pitch[0], pitch[1],
+                                (origin[0] - pitch[0] // 2, origin[1] - pitch[1] // 2))
+        # "< Page 1/2 >" above the shelf; the left half goes back a page, the right half forward
+        self.pager_rect = pygame.Rect(0, 0, columns * pitch[0], 30)
+        self.pager_rect.center = (origin[0] + (columns - 1) * pitch[0] // 2, origin[1] - 70)
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    @property
+    def per_page(self):
+        return self.columns * self.rows
+
+    @property
+    def page_count(self):
+        return max(1, -(-len(self.sprites) // self.per_page))
+
+    def slot_center(self, index):
+        slot = index % self.per_page
+        column, row = divmod(slot, self.rows)
+        return self.origin[0] + column * self.pitch[0], self.origin[1] + row * self.pitch[1]
+
+    def slot_rect(self, index):
+        rect = pygame.Rect(0, 0, *self.pitch)
+        rect.center = self.slot_center(index)
+        return rect
+
+    def page_slice(self, page):
+        start = page * self.per_page
+        return self.sprites[start:start + self.per_page]
+
+    def add(self, sprite):
+        """Put sprite in the next free slot; it is shown straight away if that slot is on this page"""
+        index = len(self.sprites)
+        self.sprites.append(sprite)
+        self.by_name[sprite.name] = sprite
+        sprite.rect.center = self.slot_center(index)
+        self.motion.add(sprite)
+        if index // self.per_page == self.page:
+            self._show(sprite, index)
+            self.version += 1
+        else:
+            self.motion.set_hidden([sprite])
+
+    def _show(self, sprite, index):
+        self.group.add(sprite)
+        self.grid.insert(sprite, self.slot_rect(index))
+
+    def set_page(self, page):
+        page %= self.page_count
+        if page == self.page:
+            return
+        shown = self.group.sprites()
+        self.motion.set_hidden(shown)
+        self.group.empty()
+        self.grid.clear()
+
+        self.page = page
+        start = page * self.per_page
+        sprites = self.page_slice(page)
+        self.motion.set_hidden(sprites, False)
+        for index, sprite in enumerate(sprites, start):
+            self._show(sprite, index)
+        self.version += 1
+
+    def scroll(self, pages):
+        """Move pages forward (or back when negative), wrapping around"""
+        self.set_page(self.page + pages)
+
+    def handle_pager_click(self, x, y):
+        """Turn the page if (x, y) is on the pager; returns True when the click was used"""
+        if self.page_count < 2 or not self.pager_rect.collidepoint(x, y):
+            return False
+        self.scroll(-1 if x < self.pager_rect.centerx else 1)
+        return True
+
+    def sprite_at(self, x, y):
+        """The visible sprite under (x, y), or None"""
+        for sprite in self.grid.query(x, y):
+            if sprite.rect.collidepoint(x, y):
+                return sprite
+        return None
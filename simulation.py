@@ -0,0 +1,298 @@
+"""Headless simulation of the Game rules for balancing difficulty settings.
+
+Runs the same Game state machine the window uses, without a display or
+sprites, at a fixed 60 ticks per simulated second. Disasters and orders come
+from Game's event queue at per-second rates on the game clock, so they happen
+as often as in play at any frame rate. A player policy decides what to click
+and when to bake: random, recipe, or a scripted list of actions read from a
+JSON file with --script.
+
+    python simulation.py --policy recipe --minutes 30 --runs 20 --seed 1
+    python simulation.py --script actions.json --minutes 5
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import statistics
+import time
+from collections import Counter
+from catalog import get_catalog
+from config import DIFFICULTY_SETTINGS
+from game_state import Game
+
+TICKS_PER_SECOND = 60
+
+class HeadlessAnimationManager:
+    """The parts of AnimationManager that Game relies on, with nothing drawn"""
+
+    is_animating = False
+
+    def __init__(self):
+        self.bowl_fill_level = 0
+
+    def reset_bowl(self):
+        self.bowl_fill_level = 0
+
+    def trigger_disaster_animation(self, disaster_type, game=None):
+        pass
+
+    def clear_disaster_animations(self):
+        pass
+
+class RandomPolicy:
+    """Clicks random shelf ingredients and bakes once the bowl holds a few"""
+
+    def __init__(self, min_ingredients=3, max_ingredients=6):
+        self.min_ingredients = min_ingredients
+        self.max_ingredients = max_ingredients
+        self.target = None
+
+    def act(self, game, rng):
+        if self.target is None:
+            self.target = rng.randint(self.min_ingredients, self.max_ingredients)
+        if len(game.current_ingredients) >= self.target:
+            game.handle_baking_process()
+            self.target = None
+            return
+        available = sorted(ing for ing, count in game.ingredient_counts.items() if count > 0)
+        if available:
+            game.use_ingredient(rng.choice(available))
+        elif not game.replenish_ingredients() and game.current_ingredients:
+            game.handle_baking_process()
+
+class RecipePolicy:
+    """Bakes known recipes, the customer's order first, and buys upgrades it can spare coins for"""
+
+    def __init__(self, upgrade_reserve=25):
+        self.upgrade_reserve = upgrade_reserve
+        self.recipe = None
+
+    def act(self, game, rng):
+        self.buy_upgrades(game)
+        if self.recipe is None:
+            self.recipe = self.choose_recipe(game, rng)
+
+        missing = Counter(game.recipes[self.recipe]) - Counter(game.current_ingredients)
+        if not missing:
+            game.handle_baking_process()
+            self.recipe = None
+            return
+
+        ing = min(missing)
+        if not game.use_ingredient(ing) and not game.replenish_ingredients():
+            # Can't finish this recipe; bake what is there rather than wait forever
+            if game.current_ingredients:
+                game.handle_baking_process()
+            self.recipe = None
+
+    def choose_recipe(self, game, rng):
+        for order in game.orders.by_deadline():
+            if order.recipe in game.discovered_recipes:
+                return order.recipe
+        return rng.choice(sorted(game.discovered_recipes))
+
+    def buy_upgrades(self, game):
+        for name, info in sorted(game.upgrades.items(), key=lambda item: item[1]["cost"]):
+            if name not in game.active_upgrades and game.bakecoin - info["cost"] >= self.upgrade_reserve:
+                game.buy_upgrade(name)
+
+# ScriptedPolicy action -> number of arguments it takes
+SCRIPT_ACTIONS = {"add": 1, "bake": 0, "replenish": 0, "upgrade": 1, "wait": 0}
+
+class ScriptedPolicy:
+    """Replays a list of actions, one per decision, looping when it runs out.
+
+    Actions are ("add", ingredient), ("bake",), ("replenish",), ("upgrade", name) or ("wait",).
+    A --script file holds the same actions as a JSON list of lists.
+    """
+
+    def __init__(self, actions):
+        self.actions = list(actions)
+        self.position = 0
+
+    def act(self, game, rng):
+        if not self.actions:
+            return
+        action, *args = self.actions[self.position]
+        self.position = (self.position + 1) % len(self.actions)
+        if action == "add":
+            game.use_ingredient(args[0])
+        elif action == "bake":
+            game.handle_baking_process()
+        elif action == "replenish":
+            game.replenish_ingredients()
+        elif action == "upgrade":
+            game.buy_upgrade(args[0])
+
+POLICIES = {
+    "random": RandomPolicy,
+    "recipe": RecipePolicy,
+}
+
+class SimulationResult:
+    def __init__(self, difficulty, seed):
+        self.difficulty = difficulty
+        self.seed = seed
+        self.seconds = 0
+        self.bakecoin_curve = []  # (simulated seconds, bakecoin)
+        self.final_bakecoin = 0
+        self.disasters = 0
+        self.orders_placed = 0
+        self.orders_filled = 0
+        self.orders_expired = 0
+        self.bakes = 0
+        self.failed_bakes = 0
+        self.upgrades = []
+
+    @property
+    def fill_rate(self):
+        """Share of placed orders that were filled; NaN when none were placed, so it isn't counted as 0"""
+        return self.orders_filled / self.orders_placed if self.orders_placed else float("nan")
+
+def simulate(difficulty, policy, seconds=600, seed=None, think_interval=0.5,
+             sample_interval=10, quiet=True, settings=None, upgrade_costs=None):
+    """Play one headless game and return its SimulationResult.
+
+    policy.act(game, rng) is called every think_interval simulated seconds,
+    and bakecoin is sampled every sample_interval seconds. settings overrides
+    values of the difficulty's DIFFICULTY_SETTINGS entry and upgrade_costs
+    maps upgrade names to replacement costs.
+    """
+    rng = random.Random(seed)
+    # Disasters and orders are rolled with the module-level RNG inside Game
+    random.seed(seed)
+
+    result = SimulationResult(difficulty, seed)
+    dt = 1 / TICKS_PER_SECOND
+    think_ticks = max(1, round(think_interval * TICKS_PER_SECOND))
+    sample_ticks = max(1, round(sample_interval * TICKS_PER_SECOND))
+    total_ticks = int(seconds * TICKS_PER_SECOND)
+
+    with open(os.devnull, "w") as sink, contextlib.ExitStack() as stack:
+        if quiet:
+            # Game reports every bake and disaster with print()
+            stack.enter_context(contextlib.redirect_stdout(sink))
+
+        game = Game(HeadlessAnimationManager(), headless=True)
+        game.difficulty_settings[difficulty].update(settings or {})
+        for name, cost in (upgrade_costs or {}).items():
+            game.upgrades[name]["cost"] = cost
+        game.start(difficulty)
+        for tick in range(total_ticks):
+            game.update(dt)
+            game.update_disaster(dt)
+            if tick % think_ticks == 0:
+                policy.act(game, rng)
+            if tick % sample_ticks == 0:
+                result.bakecoin_curve.append((tick / TICKS_PER_SECOND, game.bakecoin))
+
+    result.seconds = seconds
+    result.bakecoin_curve.append((seconds, game.bakecoin))
+    result.final_bakecoin = game.bakecoin
+    result.disasters = game.disaster_count
+    result.orders_placed = game.orders_placed
+    result.orders_filled = game.orders_filled
+    result.orders_expired = game.orders_expired
+    result.bakes = game.bakes
+    result.failed_bakes = game.failed_bakes
+    result.upgrades = sorted(game.active_upgrades)
+    return result
+
+def load_script(path):
+    """ScriptedPolicy actions from a JSON list of lists, e.g. [["add", "Flour"], ["bake"]].
+
+    Raises ValueError listing every action that names an unknown action,
+    ingredient or upgrade or has the wrong number of arguments.
+    """
+    with open(path) as f:
+        actions = json.load(f)
+    if not isinstance(actions, list):
+        raise ValueError("expected a JSON list of actions")
+
+    catalog = get_catalog()
+    ingredients = catalog.known_ingredients()
+    problems = []
+    for i, action in enumerate(actions):
+        if not isinstance(action, list) or not action:
+            problems.append(f"action {i}: expected a non-empty list, got {action!r}")
+            continue
+        name, *args = action
+        if name not in SCRIPT_ACTIONS:
+            problems.append(f"action {i}: unknown action {name!r} (known: {', '.join(SCRIPT_ACTIONS)})")
+        elif len(args) != SCRIPT_ACTIONS[name]:
+            problems.append(f"action {i}: {name!r} takes {SCRIPT_ACTIONS[name]} argument(s), got {len(args)}")
+        elif name == "add" and args[0] not in ingredients:
+            problems.append(f"action {i}: unknown ingredient {args[0]!r}")
+        elif name == "upgrade" and args[0] not in catalog.upgrades:
+            problems.append(f"action {i}: unknown upgrade {args[0]!r} (known: {', '.join(sorted(catalog.upgrades))})")
+    if problems:
+        raise ValueError("; ".join(problems))
+    return [tuple(action) for action in actions]
+
+def run_report(policy_name="recipe", seconds=600, runs=10, seed=0, difficulties=None, script=None):
+    """Simulate runs games per difficulty and return {difficulty: [SimulationResult]}
+
+    With script (a list of actions) every game is played by a fresh ScriptedPolicy instead.
+    """
+    def make_policy():
+        return ScriptedPolicy(script) if script is not None else POLICIES[policy_name]()
+
+    results = {}
+    for difficulty in difficulties or DIFFICULTY_SETTINGS:
+        results[difficulty] = [
+            simulate(difficulty, make_policy(), seconds, seed=seed + run)
+            for run in range(runs)
+        ]
+    return results
+
+def print_report(results, checkpoints=6):
+    for difficulty, runs in results.items():
+        hours = sum(r.seconds for r in runs) / 3600
+        placed = sum(r.orders_placed for r in runs)
+        filled = sum(r.orders_filled for r in runs)
+        print(f"{difficulty}: {len(runs)} runs")
+        print(f"  final bakecoin  mean {statistics.mean(r.final_bakecoin for r in runs):.1f}"
+              f"  min {min(r.final_bakecoin for r in runs)}  max {max(r.final_bakecoin for r in runs)}")
+        print(f"  disasters       {sum(r.disasters for r in runs)} ({sum(r.disasters for r in runs) / hours:.1f}/hour)")
+        print(f"  orders filled   {filled}/{placed} ({filled / placed if placed else 0:.0%}),"
+              f" {sum(r.orders_expired for r in runs)} expired")
+        print(f"  bakes           {sum(r.bakes for r in runs)} ok, {sum(r.failed_bakes for r in runs)} failed")
+
+        # Mean bakecoin curve at a few evenly spaced points
+        curve_length = min(len(r.bakecoin_curve) for r in runs)
+        step = max(1, (curve_length - 1) // checkpoints)
+        points = []
+        for i in list(range(0, curve_length - 1, step)) + [curve_length - 1]:
+            at = runs[0].bakecoin_curve[i][0]
+            points.append(f"{at / 60:.0f}m:{statistics.mean(r.bakecoin_curve[i][1] for r in runs):.0f}")
+        print(f"  bakecoin curve  {'  '.join(points)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless games and report balance statistics")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="recipe")
+    parser.add_argument("--script", metavar="FILE",
+                        help="play a JSON list of ScriptedPolicy actions instead of --policy")
+    parser.add_argument("--minutes", type=float, default=10, help="simulated minutes per game")
+    parser.add_argument("--runs", type=int, default=10, help="games per difficulty")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTY_SETTINGS), action="append",
+                        help="limit to one difficulty (repeatable)")
+    args = parser.parse_args()
+    script = None
+    if args.script:
+        try:
+            script = load_script(args.script)
+        except (OSError, ValueError, TypeError) as e:
+            parser.error(f"bad --script {args.script}: {e}")
+
+    start = time.perf_counter()
+    results = run_report(args.policy, args.minutes * 60, args.runs, args.seed, args.difficulty, script)
+    elapsed = time.perf_counter() - start
+    print_report(results)
+    ticks = sum(len(runs) for runs in results.values()) * args.minutes * 60 * TICKS_PER_SECOND
+    print(f"Simulated {ticks:.0f} ticks in {elapsed:.1f}s ({ticks / elapsed:.0f} ticks/s)")
+
+if __name__ == "__main__":
+    main()
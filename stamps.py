@@ -0,0 +1,127 @@
+import pygame
+from collections import OrderedDict
+
+# Pre-rendered particle sprites keyed by quantized (shape, size, color, alpha),
+# evicted least recently used first
+_stamps = OrderedDict()
+MAX_STAMPS = 2048
+
+ALPHA_STEP = 16
+COLOR_STEP = 8  # Per RGB channel, so a color fading every frame keeps hitting the same stamps
+
+# Rotated blob variants, built lazily and evicted least recently used first
+_rotated = OrderedDict()
+_rotated_bytes = 0
+MAX_ROTATED_BYTES = 32 * 1024 * 1024
+ANGLE_STEP = 5
+SQUISH_STEP = 0.1
+
+stats = {
+    "hits": 0,
+    "misses": 0,
+    "evictions": 0,
+    "rotated_hits": 0,
+    "rotated_misses": 0,
+    "rotated_evictions": 0,
+}
+
+def quantize_size(size):
+    """Small sizes stay exact, larger ones snap to multiples of 4 pixels"""
+    size = max(1, int(round(size)))
+    if size <= 16:
+        return size
+    return (size + 2) // 4 * 4
+
+def quantize_alpha(alpha):
+    return max(0, min(255, int(round(alpha / ALPHA_STEP)) * ALPHA_STEP))
+
+def quantize_color(color):
+    return tuple(min(255, (int(round(c)) + COLOR_STEP // 2) // COLOR_STEP * COLOR_STEP) for c in color[:3])
+
+def _cached(key, build):
+    stamp = _stamps.get(key)
+    if stamp is not None:
+        stats["hits"] += 1
+        _stamps.move_to_end(key)
+        return stamp
+
+    stats["misses"] += 1
+    stamp = build()
+    _stamps[key] = stamp
+    while len(_stamps) > MAX_STAMPS:
+        _stamps.popitem(last=False)
+        stats["evictions"] += 1
+    return stamp
+
+def circle_stamp(radius, color, alpha=255):
+    """Shared SRCALPHA surface of a filled circle, 2*radius wide (radius is quantized)"""
+    radius = quantize_size(radius)
+    color = quantize_color(color)
+    alpha = quantize_alpha(alpha)
+
+    def build():
+        surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surf, (*color, alpha), (radius, radius), radius)
+        return surf
+
+    return _cached(("circle", radius, color, alpha), build)
+
+def ellipse_stamp(width, height, color, alpha=255):
+    """Shared SRCALPHA surface of a filled ellipse filling its (quantized) bounds"""
+    width = quantize_size(width)
+    height = quantize_size(height)
+    color = quantize_color(color)
+    alpha = quantize_alpha(alpha)
+
+    def build():
+        surf = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.ellipse(surf, (*color, alpha), (0, 0, width, height))
+        return surf
+
+    return _cached(("ellipse", (width, height), color, alpha), build)
+
+def rotated_blob_stamp(size, squish, color, alpha, angle):
+    """Shared ellipse blob of size*2 by size*2*squish, rotated by angle degrees.
+
+    Size, squish and angle are bucketed so a spill reuses a small set of variants.
+    An ellipse looks the same after half a turn, so angles fold into [0, 180).
+    """
+    size = quantize_size(size)
+    squish = round(round(squish / SQUISH_STEP) * SQUISH_STEP, 2)
+    angle = int(round(angle / ANGLE_STEP)) * ANGLE_STEP % 180
+    color = quantize_color(color)
+    alpha = quantize_alpha(alpha)
+    key = (size, squish, angle, color, alpha)
+
+    stamp = _rotated.get(key)
+    if stamp is not None:
+        stats["rotated_hits"] += 1
+        _rotated.move_to_end(key)
+        return stamp
+
+    global _rotated_bytes
+    stats["rotated_misses"] += 1
+    blob = ellipse_stamp(size * 2, size * 2 * squish, color, alpha)
+    stamp = pygame.transform.rotate(blob, angle)
+    _rotated[key] = stamp
+    _rotated_bytes += stamp.get_width() * stamp.get_height() * stamp.get_bytesize()
+    while _rotated_bytes > MAX_ROTATED_BYTES and len(_rotated) > 1:
+        _, evicted = _rotated.popitem(last=False)
+        _rotated_bytes -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
+        stats["rotated_evictions"] += 1
+    return stamp
+
+def blit_stamps(surface, batch, doreturn=False):
+    """Draw a list of (stamp, position) pairs with a single Surface.blits call.
+
+    With doreturn the drawn rects are returned, as Surface.blits does.
+    """
+    if batch:
+        return surface.blits(batch, doreturn=doreturn)
+    return [] if doreturn else None
+
+def clear_stamps():
+    global _rotated_bytes
+    _stamps.clear()
+    _rotated.clear()
+    _rotated_bytes = 0
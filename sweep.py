@@ -0,0 +1,179 @@
+"""Parallel difficulty-balancing sweeps over a grid of settings.
+
+Every combination of the given setting values is played runs times per
+difficulty by headless games (see simulation.py), spread over a process
+pool. Run i of every grid point uses the same seed, derived from --seed, so
+grid points are compared on identical dice rolls and any sweep can be
+reproduced exactly regardless of how jobs land on workers.
+
+    python sweep.py --difficulty Normal --disaster-chance 0.0005,0.001,0.002 \\
+        --bakecoin-multiplier 0.75,1.0 --upgrade-cost "Better Oven=25,50" \\
+        --runs 200 --minutes 20 --csv sweep.csv
+"""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import csv
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from catalog import get_catalog
+from config import DIFFICULTY_SETTINGS
+from simulation import POLICIES, simulate
+
+PERCENTILES = (10, 50, 90)
+METRICS = ("final_bakecoin", "disasters_per_hour", "fill_rate", "failed_bake_rate", "upgrades")
+
+def parse_values(text, kind=float):
+    return [kind(value) for value in text.split(",") if value.strip()]
+
+def parse_upgrade_cost(text):
+    name, _, values = text.partition("=")
+    if not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=COST[,COST...], got {text!r}")
+    return name.strip(), parse_values(values, int)
+
+def build_grid(settings, upgrade_costs):
+    """List of (settings overrides, upgrade cost overrides) for every combination of values"""
+    axes = [("setting", name, values) for name, values in settings.items()]
+    axes += [("upgrade", name, values) for name, values in upgrade_costs.items()]
+    grid = []
+    for combo in itertools.product(*(values for _, _, values in axes)):
+        point_settings, point_costs = {}, {}
+        for (kind, name, _), value in zip(axes, combo):
+            (point_settings if kind == "setting" else point_costs)[name] = value
+        grid.append((point_settings, point_costs))
+    return grid
+
+def run_seeds(seed, runs):
+    """One reproducible seed per run index, independent of the worker that plays it"""
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(runs)]
+
+def play(job):
+    """Worker entry point: play one game and return its summary row"""
+    point, difficulty, settings, upgrade_costs, policy_name, seconds, seed = job
+    result = simulate(difficulty, POLICIES[policy_name](), seconds, seed=seed,
+                      settings=settings, upgrade_costs=upgrade_costs)
+    plays = result.bakes + result.failed_bakes
+    return point, difficulty, {
+        "final_bakecoin": result.final_bakecoin,
+        "disasters_per_hour": result.disasters * 3600 / seconds,
+        "fill_rate": result.fill_rate,
+        # NaN for runs with nothing to rate; summary_rows leaves them out
+        "failed_bake_rate": result.failed_bakes / plays if plays else np.nan,
+        "upgrades": len(result.upgrades),
+    }
+
+def sweep(grid, difficulties, runs, seconds, policy_name="recipe", seed=0, workers=None):
+    """Play every grid point and return {(point index, difficulty): {metric: [values]}}"""
+    seeds = run_seeds(seed, runs)
+    jobs = [
+        (point, difficulty, settings, upgrade_costs, policy_name, seconds, run_seed)
+        for point, (settings, upgrade_costs) in enumerate(grid)
+        for difficulty in difficulties
+        for run_seed in seeds
+    ]
+    workers = workers or os.cpu_count() or 1
+    # Big chunks keep the pickling overhead small next to games that take a few ms each
+    chunksize = max(1, len(jobs) // (workers * 8))
+
+    merged = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for point, difficulty, row in pool.map(play, jobs, chunksize=chunksize):
+            metrics = merged.setdefault((point, difficulty), {metric: [] for metric in METRICS})
+            for metric, value in row.items():
+                metrics[metric].append(value)
+    return merged
+
+def summary_rows(grid, merged):
+    """One row per grid point and difficulty with the mean and percentiles of every metric.
+
+    NaN values (fill rate without orders, failed bake rate without bakes) are
+    left out; a metric that is NaN in every run is reported as NaN.
+    """
+    rows = []
+    for (point, difficulty), metrics in sorted(merged.items()):
+        settings, upgrade_costs = grid[point]
+        row = {"difficulty": difficulty, "runs": len(metrics["final_bakecoin"])}
+        row.update(settings)
+        row.update({f"cost:{name}": cost for name, cost in upgrade_costs.items()})
+        for metric, values in metrics.items():
+            values = np.asarray(values, dtype=float)
+            if np.isnan(values).all():
+                row[f"{metric}_mean"] = np.nan
+                row.update({f"{metric}_p{pct}": np.nan for pct in PERCENTILES})
+                continue
+            row[f"{metric}_mean"] = round(float(np.nanmean(values)), 4)
+            for pct, value in zip(PERCENTILES, np.nanpercentile(values, PERCENTILES)):
+                row[f"{metric}_p{pct}"] = round(float(value), 4)
+        rows.append(row)
+    return rows
+
+def print_table(rows):
+    if not rows:
+        return
+    params = [key for key in rows[0] if key not in ("difficulty", "runs") and "_p" not in key
+              and not key.endswith("_mean")]
+    header = ["difficulty"] + params + [f"{m} p{p}" for m in ("final_bakecoin", "fill_rate")
+                                        for p in PERCENTILES] + ["disasters/h p50"]
+    table = [header]
+    for row in rows:
+        table.append([row["difficulty"]] + [str(row[p]) for p in params] +
+                     [f"{row[f'{m}_p{p}']:g}" for m in ("final_bakecoin", "fill_rate")
+                      for p in PERCENTILES] +
+                     [f"{row['disasters_per_hour_p50']:g}"])
+    widths = [max(len(line[i]) for line in table) for i in range(len(header))]
+    for line in table:
+        print("  ".join(cell.rjust(width) for cell, width in zip(line, widths)))
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep difficulty settings with parallel headless games")
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTY_SETTINGS), action="append",
+                        help="difficulty to sweep (repeatable, default all)")
+    parser.add_argument("--disaster-chance", type=parse_values, help="comma separated values")
+    parser.add_argument("--customer-order-chance", type=parse_values, help="comma separated values")
+    parser.add_argument("--bakecoin-multiplier", type=parse_values, help="comma separated values")
+    parser.add_argument("--upgrade-cost", type=parse_upgrade_cost, action="append", default=[],
+                        metavar="NAME=COST[,COST...]", help="upgrade costs to try (repeatable)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="recipe")
+    parser.add_argument("--runs", type=int, default=100, help="games per grid point and difficulty")
+    parser.add_argument("--minutes", type=float, default=20, help="simulated minutes per game")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--csv", help="write the percentile table to this CSV file")
+    args = parser.parse_args()
+
+    # Catch typos here rather than as a KeyError in every worker
+    upgrades = get_catalog().upgrades
+    for name, _ in args.upgrade_cost:
+        if name not in upgrades:
+            parser.error(f"unknown upgrade {name!r} in --upgrade-cost (known: {', '.join(sorted(upgrades))})")
+
+    settings = {name: getattr(args, name) for name in
+                ("disaster_chance", "customer_order_chance", "bakecoin_multiplier")
+                if getattr(args, name)}
+    grid = build_grid(settings, dict(args.upgrade_cost))
+    difficulties = args.difficulty or list(DIFFICULTY_SETTINGS)
+
+    start = time.perf_counter()
+    merged = sweep(grid, difficulties, args.runs, args.minutes * 60, args.policy, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+
+    rows = summary_rows(grid, merged)
+    print_table(rows)
+    games = len(grid) * len(difficulties) * args.runs
+    print(f"{games} games ({len(grid)} grid points) in {elapsed:.1f}s")
+    if args.csv:
+        write_csv(args.csv, rows)
+        print(f"Wrote {args.csv}")
+
+if __name__ == "__main__":
+    main()
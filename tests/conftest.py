@@ -0,0 +1,18 @@
+import os
+import sys
+import pytest
+
+# Run pygame without a window or sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from font_cache import clear_cache  # Imported after the path is set
+
+@pytest.fixture(autouse=True)
+def fresh_font_cache():
+    # Fonts die with pygame.quit(), so one test's cached fonts must not reach the next
+    yield
+    clear_cache()
@@ -0,0 +1,37 @@
+import math
+import random
+import numpy as np
+import pygame
+import pytest
+from background import Background
+from config import WIDTH, HEIGHT
+
+@pytest.fixture
+def screen():
+    pygame.init()
+    yield pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.quit()
+
+def test_stars_are_drawn_under_the_grid_and_fog(screen):
+    random.seed(5)
+    background = Background()
+    # Two overlapping stars, so merged patches are exercised too
+    background.stars[:2] = [(200, 200), (201, 202)]
+    background.update()
+    background.draw(screen)
+
+    expected = background.base_layer.copy()
+    for star in background.stars:
+        brightness = int(128 + 127 * math.sin(background.time + hash(star) % 360))
+        pygame.draw.circle(expected, (brightness, brightness, brightness), star, 1)
+    expected.blit(background.grid_layer, (0, 0))
+    expected.blit(background.fog_layer, (0, 0))
+    assert np.array_equal(pygame.surfarray.array3d(screen), pygame.surfarray.array3d(expected))
+
+def test_perspective_grid_follows_the_size_it_is_built_for(screen):
+    background = Background()
+    default_points = list(background.perspective_points)
+    background.build_static_layer((WIDTH // 2, HEIGHT // 2))
+    assert background.perspective_points != default_points
+    background.build_static_layer((WIDTH, HEIGHT))
+    assert background.perspective_points == default_points
@@ -0,0 +1,84 @@
+import json
+import os
+import pickle
+import time
+import pygame
+import catalog
+from catalog import Catalog, load_compiled, recipe_key
+from game_state import Game
+from simulation import HeadlessAnimationManager
+
+def write_pack(path, recipes):
+    with open(path, "w") as f:
+        json.dump({"recipes": recipes, "colors": {"Stardust": [1, 2, 3]}}, f)
+
+def test_unreadable_cache_falls_back_to_compiling(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog, "CACHE_DIR", str(tmp_path / "cache"))
+    source = tmp_path / "pack.json"
+    write_pack(source, {"Star Cake": ["Stardust", "Flour"]})
+    load_compiled(str(source))
+    (cache_file,) = os.listdir(catalog.CACHE_DIR)
+
+    # A pickle of a class that no longer exists raises AttributeError on load
+    payload = pickle.dumps(object()).replace(b"builtins", b"catalog").replace(b"object", b"Gone")
+    with open(os.path.join(catalog.CACHE_DIR, cache_file), "wb") as f:
+        f.write(payload)
+    compiled = load_compiled(str(source))
+    assert compiled["recipes"] == {"Star Cake": ["Stardust", "Flour"]}
+
+def test_recompiling_prunes_the_superseded_cache_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog, "CACHE_DIR", str(tmp_path / "cache"))
+    other = tmp_path / "other.json"
+    write_pack(other, {})
+    load_compiled(str(other))
+    source = tmp_path / "pack.json"
+    write_pack(source, {"Star Cake": ["Stardust", "Flour"]})
+    load_compiled(str(source))
+    write_pack(source, {"Star Pie": ["Stardust", "Butter"]})
+    load_compiled(str(source))
+
+    names = os.listdir(catalog.CACHE_DIR)
+    assert len(names) == 2
+    assert sum(name.startswith("pack-") for name in names) == 1
+
+def test_packs_compile_off_the_frame_and_load_in_slices(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog, "CACHE_DIR", str(tmp_path / "cache"))
+    pack_dir = tmp_path / "packs"
+    pack_dir.mkdir()
+    write_pack(pack_dir / "stars.json",
+               {f"Star Cake {i}": ["Stardust", "Flour", f"Moon {i}"] for i in range(1000)})
+    pack_catalog = Catalog(pack_dir=str(pack_dir))
+    monkeypatch.setattr(catalog, "_catalog", pack_catalog)
+
+    game = Game(HeadlessAnimationManager(), headless=True)
+    assert pack_catalog.packs_loaded()
+    assert game.load_pack_content(limit=100)
+    assert len(game.recipes) == len(pack_catalog.recipes) + 100
+    while game.load_pack_content(limit=100):
+        pass
+    assert game.recipe_index[recipe_key(["Moon 7", "Flour", "Stardust"])] == "Star Cake 7"
+    assert game.ingredient_table.color("Stardust") == (1, 2, 3)
+
+def test_ticks_do_not_wait_for_a_pack_still_compiling(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog, "CACHE_DIR", str(tmp_path / "cache"))
+    pack_dir = tmp_path / "packs"
+    pack_dir.mkdir()
+    write_pack(pack_dir / "stars.json", {"Star Cake": ["Stardust", "Flour"]})
+    slow_load = catalog.load_compiled
+
+    def load_compiled_slowly(path):
+        time.sleep(0.3)
+        return slow_load(path)
+    monkeypatch.setattr(catalog, "load_compiled", load_compiled_slowly)
+    pack_catalog = Catalog(pack_dir=str(pack_dir))
+    monkeypatch.setattr(catalog, "_catalog", pack_catalog)
+
+    pygame.init()
+    game = Game(HeadlessAnimationManager())
+    start = time.perf_counter()
+    assert game.load_pack_content()
+    assert time.perf_counter() - start < 0.1
+    pack_catalog.wait_for_packs()
+    assert not game.load_pack_content()
+    assert "Star Cake" in game.recipes
+    pygame.quit()
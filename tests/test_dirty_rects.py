@@ -0,0 +1,71 @@
+import random
+import numpy as np
+import pygame
+import pytest
+import dirty_rects
+from animation import AnimationManager, PopupText
+from background import Background
+from config import WIDTH, HEIGHT
+from drawing_utils import draw_game, update_bakecoin_display
+from game_state import Game
+
+@pytest.fixture
+def screen():
+    pygame.init()
+    yield pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.quit()
+
+class ShadowDisplay:
+    """Stands in for the display: keeps only what was pushed to it"""
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.surface = pygame.Surface(screen.get_size())
+
+    def flip(self):
+        self.surface.blit(self.screen, (0, 0))
+
+    def update(self, rects):
+        for rect in rects:
+            self.surface.blit(self.screen, rect, rect)
+
+    def matches(self):
+        return np.array_equal(pygame.surfarray.pixels2d(self.surface), pygame.surfarray.pixels2d(self.screen))
+
+def test_pushed_rects_cover_every_changed_pixel(screen, monkeypatch):
+    random.seed(3)
+    np.random.seed(3)
+    shadow = ShadowDisplay(screen)
+    monkeypatch.setattr(pygame.display, "flip", shadow.flip)
+    monkeypatch.setattr(pygame.display, "update", shadow.update)
+    tracker = dirty_rects.tracker
+    monkeypatch.setattr(tracker, "enabled", True)
+
+    animation_manager = AnimationManager()
+    game = Game(animation_manager)
+    game.start("Normal")
+    background = Background()
+    popup_text = None
+    for frame in range(240):
+        if frame % 20 == 5:
+            sprite = game.ingredient_sprites.sprites()[frame // 20 % len(game.ingredient_sprites)]
+            ing, x, y = game.handle_ingredient_click(*sprite.rect.center)
+            if ing:
+                animation_manager.add_ingredient_animation(ing, x, y)
+        if frame == 100:
+            popup_text = PopupText("Cookies!", WIDTH // 2, HEIGHT // 2)
+        if frame == 150:
+            game.kitchen_disaster = "Ingredient spill"
+
+        background.update()
+        background.draw(screen)
+        game.update(1 / 60)
+        game.update_disaster(1 / 60)
+        draw_game(screen, game, animation_manager, 1 / 60)
+        update_bakecoin_display(screen, game)
+        if popup_text:
+            popup_text.update()
+            popup_text.draw(screen)
+        tracker.present(screen)
+        assert shadow.matches(), f"frame {frame} left stale pixels on the display"
+    assert tracker.partial_updates > 0
@@ -0,0 +1,35 @@
+import pygame
+import pytest
+from animation import AnimationManager
+from config import WIDTH, HEIGHT
+from drawing_utils import bowl_panel, draw_game, update_bakecoin_display, hud
+from game_state import Game
+
+@pytest.fixture
+def screen():
+    pygame.init()
+    yield pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.quit()
+
+def new_game(recipe, ingredient):
+    game = Game(AnimationManager())
+    game.start("Normal")
+    game.place_order(recipe)
+    game.add_to_bowl(ingredient)
+    return game
+
+def test_second_game_does_not_show_the_first_games_panels(screen):
+    first = new_game("Cake", "Flour")
+    draw_game(screen, first, first.animation_manager)
+    update_bakecoin_display(screen, first)
+    first_bowl = bowl_panel.surface
+
+    # Same version counters as the first game, different orders and bowl
+    second = new_game("Cookies", "Sugar")
+    assert second.orders.version == first.orders.version
+    assert second.bowl_counts.version == first.bowl_counts.version
+    draw_game(screen, second, second.animation_manager)
+    update_bakecoin_display(screen, second)
+
+    assert [order.recipe for order in hud.order_panel.orders] == ["Cookies"]
+    assert bowl_panel.surface is not first_bowl
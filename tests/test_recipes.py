@@ -0,0 +1,17 @@
+from game_logic import match_recipe
+from game_state import Game
+from simulation import HeadlessAnimationManager
+
+def test_replaced_recipe_hands_its_key_to_a_twin():
+    game = Game(HeadlessAnimationManager(), headless=True)
+    game.add_recipe("Plain Cake", ["Flour", "Sugar"])
+    game.add_recipe("Sweet Bread", ["Sugar", "Flour"])
+    for ing in ("Flour", "Sugar"):
+        game.add_to_bowl(ing)
+    assert match_recipe(game) == "Plain Cake"
+
+    # Plain Cake changes; Sweet Bread still uses the old ingredients
+    game.add_recipe("Plain Cake", ["Flour", "Sugar", "Eggs"])
+    assert match_recipe(game) == "Sweet Bread"
+    game.add_recipe("Sweet Bread", ["Flour"])
+    assert match_recipe(game) is None
@@ -0,0 +1,33 @@
+import math
+import random
+from game_state import Game
+from scheduler import EventScheduler, rate_from_chance
+from simulation import HeadlessAnimationManager
+
+def test_certain_chance_gives_a_finite_rate():
+    assert rate_from_chance(1.0, 60) == 60
+    assert rate_from_chance(2.0, 60) == 60
+    assert math.isfinite(rate_from_chance(0.999999, 60))
+    assert rate_from_chance(0, 60) == 0
+
+def test_event_rescheduled_while_due_waits_for_the_next_call():
+    events = EventScheduler()
+    events.schedule("order", 1.0)
+    seen = []
+    for name, _ in events.due(1.0):
+        seen.append(name)
+        # Already due, but pushed during the pass
+        events.schedule("order", 1.0)
+    assert seen == ["order"]
+    assert list(events.due(1.0)) == [("order", None)]
+
+def test_update_returns_with_certain_order_chance():
+    random.seed(0)
+    game = Game(HeadlessAnimationManager(), headless=True)
+    for values in game.difficulty_settings.values():
+        values["customer_order_chance"] = 1.0
+        values["disaster_chance"] = 1.0
+    game.start("Normal")
+    for _ in range(120):
+        game.update(1 / 60)
+    assert game.orders_placed > 0
@@ -0,0 +1,65 @@
+import random
+import time
+import numpy as np
+import pygame
+import pytest
+from animation import AnimationManager, ScreenFlash
+from background import Background
+from config import WIDTH, HEIGHT
+from drawing_utils import draw_game, update_bakecoin_display
+from game_state import Game
+
+FRAME_BUDGET = 0.05  # Seconds; a single blocking flash step used to take 0.2
+WARMUP_FRAMES = 5    # Untimed frames that build the background, font and bowl caches
+
+@pytest.fixture
+def screen():
+    pygame.init()
+    yield pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.quit()
+
+def test_disaster_flash_never_blocks_a_frame(screen, monkeypatch):
+    random.seed(1)
+    np.random.seed(1)
+
+    def blocked(*args):
+        raise AssertionError("disaster effects must not flip or sleep on their own")
+    monkeypatch.setattr(pygame.display, "flip", blocked)
+    monkeypatch.setattr(pygame.time, "delay", blocked)
+    monkeypatch.setattr(pygame.time, "wait", blocked)
+
+    animation_manager = AnimationManager()
+    game = Game(animation_manager)
+    game.start("Normal")
+    background = Background()
+    sprite = game.ingredient_sprites.sprites()[0]
+    game.handle_ingredient_click(*sprite.rect.center)
+    assert game.current_ingredients
+
+    dt = 1 / 60
+    screen_flash = None
+    flashed_frames = 0
+    slowest = 0
+    for frame in range(WARMUP_FRAMES + 120):
+        if frame == WARMUP_FRAMES:
+            game.kitchen_disaster = "Ingredient spill"
+        start = time.perf_counter()
+        background.update()
+        background.draw(screen)
+        if game.update_disaster(dt):
+            screen_flash = ScreenFlash()
+        draw_game(screen, game, animation_manager, dt)
+        update_bakecoin_display(screen, game)
+        if screen_flash:
+            screen_flash.update(dt)
+            screen_flash.draw(screen)
+            flashed_frames += 1
+            if screen_flash.is_finished():
+                screen_flash = None
+        if frame >= WARMUP_FRAMES:
+            slowest = max(slowest, time.perf_counter() - start)
+
+    # The flash ran across many frames and finished, none of them over budget
+    assert flashed_frames > 1
+    assert screen_flash is None
+    assert slowest < FRAME_BUDGET, f"slowest frame took {slowest * 1000:.1f} ms"
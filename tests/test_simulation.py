@@ -0,0 +1,27 @@
+import json
+import pytest
+from catalog import get_catalog
+from simulation import ScriptedPolicy, load_script, simulate
+
+def write_script(tmp_path, actions):
+    path = tmp_path / "script.json"
+    path.write_text(json.dumps(actions))
+    return str(path)
+
+def test_script_with_unknown_names_is_rejected_before_playing(tmp_path):
+    table = get_catalog().ingredients
+    known = len(table)
+    path = write_script(tmp_path, [["add", "Flour"], ["add", "Flur"], ["upgrade", "Typo"],
+                                   ["dance"], ["upgrade"], ["bake", 1]])
+    with pytest.raises(ValueError) as error:
+        load_script(path)
+    for problem in ("'Flur'", "'Typo'", "'dance'", "action 4", "action 5"):
+        assert problem in str(error.value)
+    assert "Flour" not in str(error.value)
+    assert len(table) == known  # Nothing was interned while checking
+
+def test_valid_script_plays(tmp_path):
+    path = write_script(tmp_path, [["add", "Flour"], ["upgrade", "Better Oven"], ["bake"], ["wait"]])
+    actions = load_script(path)
+    result = simulate("Normal", ScriptedPolicy(actions), seconds=10, seed=1)
+    assert result.bakes + result.failed_bakes > 0
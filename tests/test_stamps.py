@@ -0,0 +1,27 @@
+import pytest
+import stamps
+from stamps import circle_stamp, clear_stamps
+
+@pytest.fixture(autouse=True)
+def fresh_stamps():
+    clear_stamps()
+    yield
+    clear_stamps()
+
+def test_fading_color_reuses_stamps():
+    # A bowl color interpolating a little each frame, as sugar crystals see it
+    misses = stamps.stats["misses"]
+    for frame in range(60):
+        t = frame / 59
+        circle_stamp(4, (200 + 20 * t, 150 - 10 * t, 100), 128)
+    assert stamps.stats["misses"] - misses <= 6
+    assert circle_stamp(4, (255, 255, 255)).get_at((4, 4))[:3] == (255, 255, 255)
+
+def test_full_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(stamps, "MAX_STAMPS", 4)
+    kept = circle_stamp(1, (0, 0, 0))
+    for radius in range(2, 6):
+        circle_stamp(radius, (0, 0, 0))
+        assert circle_stamp(1, (0, 0, 0)) is kept  # Still recently used
+    assert len(stamps._stamps) == 4
+    assert ("circle", 2, (0, 0, 0), 255) not in stamps._stamps
@@ -0,0 +1,13 @@
+import math
+from sweep import METRICS, summary_rows
+
+def test_runs_without_orders_or_bakes_are_left_out_of_rates():
+    metrics = {metric: [1.0, 1.0, 1.0] for metric in METRICS}
+    metrics["fill_rate"] = [1.0, math.nan, 0.5]
+    metrics["failed_bake_rate"] = [math.nan] * 3
+    (row,) = summary_rows([({}, {})], {(0, "Normal"): metrics})
+    assert row["fill_rate_mean"] == 0.75
+    assert row["fill_rate_p10"] == 0.55
+    assert math.isnan(row["failed_bake_rate_mean"])
+    assert math.isnan(row["failed_bake_rate_p50"])
+    assert row["final_bakecoin_mean"] == 1.0
@@ -1,12 +1,12 @@
 import pygame
 from config import WIDTH, HEIGHT, BLACK, WHITE
+from font_cache import render_text
 
 def draw_intro_screen(screen):
     screen.fill(BLACK)
     
     # Create semi-transparent background for title
-    title_font = pygame.font.Font(None, 64)
-    title_text = title_font.render("Bakecoin", True, WHITE, None)
+    title_text = render_text("Bakecoin", 64, WHITE)
     
     # Create background surface for title
     title_bg = pygame.Surface((title_text.get_width() + 40, title_text.get_height() + 20), pygame.SRCALPHA)
@@ -19,8 +19,7 @@ def draw_intro_screen(screen):
     screen.blit(title_text, (title_x, title_y))
     
     # Create semi-transparent background for start text
-    start_font = pygame.font.Font(None, 32)
-    start_text = start_font.render("Press ENTER to start", True, WHITE, None)
+    start_text = render_text("Press ENTER to start", 32, WHITE)
     
     # Create background surface for start text
     start_bg = pygame.Surface((start_text.get_width() + 40, start_text.get_height() + 20), pygame.SRCALPHA)
@@ -33,8 +32,8 @@ def draw_intro_screen(screen):
     screen.blit(start_text, (start_x, start_y))
 
 def handle_dialogue(screen, game):
+    """Draw the prompt for the current state; the main loop handles the key presses"""
     screen.fill(BLACK)
-    font = pygame.font.Font(None, 32)
     if game.state == "intro":
         text = "Welcome to Bakecoin! Press ENTER to start."
     elif game.state == "choose_difficulty":
@@ -44,37 +43,16 @@ def handle_dialogue(screen, game):
     else:
         return
 
-    text_surface = font.render(text, True, WHITE)
+    text_surface = render_text(text, 32, WHITE)
     screen.blit(text_surface, (WIDTH // 2 - text_surface.get_width() // 2, HEIGHT // 2))
-    pygame.display.flip()
-
-    print(f"Handling dialogue for state: {game.state}")  # Debug print
-
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
-            if event.type == pygame.KEYDOWN:
-                if game.state == "intro" and event.key == pygame.K_RETURN:
-                    game.state = "choose_difficulty"
-                    waiting = False
-                elif game.state == "choose_difficulty":
-                    if event.key in [pygame.K_e, pygame.K_n, pygame.K_h]:
-                        game.choose_difficulty(event.key)
-                        waiting = False
-    
-    print(f"Dialogue ended. Game state: {game.state}, Bakecoin: {game.bakecoin}")  # Debug print
 
 def draw_recipe_book_screen(screen, game):
     screen.fill((255, 255, 255))
-    font = pygame.font.Font(None, 24)
     y = 50
     for recipe in game.discovered_recipes:
-        text = font.render(recipe, True, (0, 0, 0))
+        text = render_text(recipe, 24, (0, 0, 0))
         screen.blit(text, (50, y))
         y += 30
     
-    back_text = font.render("Press B to go back", True, (0, 0, 0))
+    back_text = render_text("Press B to go back", 24, (0, 0, 0))
     screen.blit(back_text, (WIDTH // 2 - back_text.get_width() // 2, HEIGHT - 50))